@@ -0,0 +1,100 @@
+# =============================================================================
+# asyncClient.py
+#
+# A non-blocking wrapper around the WPM API classes.  Every API method of the
+# wrapped object returns a Future instead of waiting on the response.
+#
+# Requires non-standard 'client' (WPM) python library to be installed.
+#
+# Version: 1.0
+# Date: 10/17/26
+# =============================================================================
+from executor import Executor, wait
+from deadline import Deadline
+
+class AsyncClient:
+
+	# -------------------------------------------------------------------------
+	# Create a new AsyncClient object.
+	#
+	# client - Client object to wrap (Monitor, RUM, LoadTest, etc.)
+	# executor - Executor to run calls on (defaults to a new one)
+	# workers - Number of calls kept in flight (defaults to the transport's pool size)
+	def __init__(self, client, executor=None, workers=None):
+		self.client		= client
+		self.executor	= executor or Executor(workers or client.transport.poolMaxSize, 'wpm-async')
+
+	# -------------------------------------------------------------------------
+	# Override string representation of AsyncClient object.
+	def __str__(self):
+		return '[%s: %s, %s]' % (self.__class__.__name__, self.client, self.executor)
+
+	# -------------------------------------------------------------------------
+	# Expose every public method of the wrapped client as a non-blocking call.
+	def __getattr__(self, name):
+		if name.startswith('_'):
+			raise AttributeError(name)
+
+		attr = getattr(self.client, name)
+
+		if not callable(attr):
+			return attr
+
+		def submit(*args, **kwargs):
+			return self.executor.submit(self.__invoke, name, args, kwargs, Deadline.current())
+
+		submit.__name__ = name
+		return submit
+
+	# -------------------------------------------------------------------------
+	# Run an API method of the wrapped client on a worker thread, within the
+	# Deadline that was in effect when the call was made.
+	def __invoke(self, name, args, kwargs, deadline):
+		return Deadline.within(deadline, lambda: getattr(self.client, name)(*args, **kwargs))
+
+	# -------------------------------------------------------------------------
+	# Wait for a group of Futures and return their results in order.
+	#
+	# futures - List of Futures returned by this object's API methods
+	# timeout - Seconds to wait for all of them (None waits forever)
+	def gather(self, futures, timeout=None):
+		wait(futures, timeout)
+		return [future.result(0) for future in futures]
+
+	# -------------------------------------------------------------------------
+	# Stop the worker threads once in-flight calls have finished.
+	def close(self):
+		self.executor.shutdown()
+
+# -----------------------------------------------------------------------------
+# Testing code
+if __name__ == '__main__':
+
+	import json
+	from tester import Tester
+	from monitor import Monitor
+
+	# Variables for testing
+	key		= Tester.wpmAPIKey
+	secret	= Tester.wpmAPISecret
+
+	# Test __init__
+	print '**** TEST: __init__'
+	asyncMonitor = AsyncClient(Monitor(key, secret))
+	print asyncMonitor
+
+	# Test a single non-blocking call
+	print '**** TEST: getLocations'
+	future		= asyncMonitor.getLocations()
+	print future.result().text
+
+	# Test gather
+	print '**** TEST: gather'
+	response	= asyncMonitor.listMonitors().result()
+	monitors	= json.loads(response.text).get('data', {}).get('items', [])
+	futures		= [asyncMonitor.getMonitorSummary(m['id']) for m in monitors]
+
+	for response in asyncMonitor.gather(futures):
+		print response.text
+
+	asyncMonitor.close()
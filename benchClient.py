@@ -0,0 +1,172 @@
+# =============================================================================
+# benchClient.py
+#
+# Benchmark suite for the WPM API classes against the local mock server
+# (see mockServer.py).  Reports calls/sec, p50/p99 latency and peak RSS for
+# sequential, threaded, batch (callMany) and async (AsyncClient) modes.
+#
+# Each mode runs in its own process, and the mock server in another, so
+# results (and peak RSS in particular) don't bleed into each other.
+#
+# Usage: python benchClient.py [--calls 1000] [--workers 16] [--latency 0.02]
+#
+# Version: 1.0
+# Date: 10/17/26
+# =============================================================================
+import os
+import sys
+import json
+import time
+import socket
+import argparse
+import resource
+import subprocess
+
+modes = ('sequential', 'threaded', 'batch', 'async')
+
+# -----------------------------------------------------------------------------
+# Get the value at percentile p (0-100) of a sorted list.
+def percentile(values, p):
+	if not values:
+		return 0
+
+	return values[min(len(values) - 1, int(round(p / 100.0 * (len(values) - 1))))]
+
+# -----------------------------------------------------------------------------
+# Run one benchmark mode in this process and return its results.
+#
+# mode - One of modes
+# base - Mock server base URL
+# calls - Number of API calls to make
+# workers - Concurrency for the threaded, batch and async modes
+def runMode(mode, base, calls, workers):
+	from client import Client
+	from monitor import Monitor
+	from rum import RUM
+	from metrics import Metrics
+	from executor import Executor
+	from transport import Transport
+	from asyncClient import AsyncClient
+
+	Client.wpmAPIBase	= base
+	Client.debug		= 0
+
+	latencies	= []
+	metrics		= Metrics(hook=lambda record: latencies.append(record['total']))
+	transport	= Transport(poolMaxSize=max(workers, 1))
+	monitor		= Monitor('benchKey', 'benchSecret', transport=transport, metrics=metrics)
+	rum			= RUM('benchKey', 'benchSecret', transport=transport, metrics=metrics)
+	monitorIds	= [m['id'] for m in monitor.callItems('listMonitors')]
+	del latencies[:]
+
+	# A mix of the calls dashboards and collectors make.
+	workload	= []
+
+	for i in range(calls):
+		if i % 4 == 3:
+			workload.append((rum, 'getPerformanceSummaryOnRecentData', ({'minutes': 60, 'allbeacons': 1},)))
+		elif i % 4 == 2:
+			workload.append((monitor, 'getMonitor', (monitorIds[i % len(monitorIds)],)))
+		else:
+			workload.append((monitor, 'getMonitorSummary', (monitorIds[i % len(monitorIds)],)))
+
+	errors	= 0
+	start	= time.time()
+
+	if mode == 'sequential':
+		for client, name, args in workload:
+			errors += not getattr(client, name)(*args)
+
+	elif mode == 'threaded':
+		executor	= Executor(workers, 'bench')
+		futures		= [executor.submit(getattr(client, name), *args) for client, name, args in workload]
+		errors		= sum(1 for future in futures if not future.result())
+		executor.shutdown()
+
+	elif mode == 'batch':
+		for client in (monitor, rum):
+			results	= client.callMany([(name, args) for c, name, args in workload if c is client], workers=workers)
+			errors	+= sum(1 for result in results if result.error)
+
+	elif mode == 'async':
+		executor	= Executor(workers, 'bench')
+		clients		= {monitor: AsyncClient(monitor, executor), rum: AsyncClient(rum, executor)}
+		futures		= [getattr(clients[client], name)(*args) for client, name, args in workload]
+		errors		= sum(1 for response in clients[monitor].gather(futures) if not response)
+		executor.shutdown()
+
+	elapsed		= time.time() - start
+	latencies	= sorted(latencies)
+
+	return {
+		'mode'		: mode,
+		'calls'		: calls,
+		'errors'	: errors,
+		'seconds'	: elapsed,
+		'callsPerSec': calls / elapsed,
+		'p50'		: percentile(latencies, 50) * 1000,
+		'p99'		: percentile(latencies, 99) * 1000,
+		'peakRSS'	: resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024.0,
+	}
+
+# -----------------------------------------------------------------------------
+# Find a free local port for the mock server.
+def freePort():
+	sock = socket.socket()
+	sock.bind(('127.0.0.1', 0))
+	port = sock.getsockname()[1]
+	sock.close()
+	return port
+
+# -----------------------------------------------------------------------------
+# Start the mock server in its own process and wait for it to listen.
+def startServer(args):
+	port	= freePort()
+	here	= os.path.dirname(os.path.abspath(__file__))
+	server	= subprocess.Popen([sys.executable, os.path.join(here, 'mockServer.py'), '--port', str(port),
+		'--latency', str(args.latency), '--jitter', str(args.jitter), '--items', str(args.items),
+		'--item-size', str(args.item_size), '--error-rate', str(args.error_rate)], stdout=subprocess.PIPE)
+
+	for x in range(100):
+		try:
+			socket.create_connection(('127.0.0.1', port), 0.1).close()
+			break
+		except socket.error:
+			time.sleep(0.05)
+
+	return server, 'http://127.0.0.1:%d/performance/' % port
+
+# -----------------------------------------------------------------------------
+# Run the benchmark suite.
+if __name__ == '__main__':
+
+	parser = argparse.ArgumentParser(description='Benchmark the WPM API classes against a local mock server.')
+	parser.add_argument('--calls', type=int, default=1000)
+	parser.add_argument('--workers', type=int, default=16)
+	parser.add_argument('--latency', type=float, default=0.02, help='mock server seconds per response')
+	parser.add_argument('--jitter', type=float, default=0.0, help='mock server extra random seconds per response')
+	parser.add_argument('--items', type=int, default=10, help='mock server items per list call')
+	parser.add_argument('--item-size', type=int, default=0, help='mock server padding bytes per item')
+	parser.add_argument('--error-rate', type=float, default=0.0, help='mock server fraction of 503 responses')
+	parser.add_argument('--modes', default=','.join(modes))
+	parser.add_argument('--base', help='use a running server instead of starting one')
+	parser.add_argument('--child', help=argparse.SUPPRESS)
+	args = parser.parse_args()
+
+	if args.child:
+		print json.dumps(runMode(args.child, args.base, args.calls, args.workers))
+		sys.exit(0)
+
+	server, base = (None, args.base) if args.base else startServer(args)
+
+	try:
+		print '%-12s %8s %8s %10s %9s %9s %10s' % ('mode', 'calls', 'errors', 'calls/sec', 'p50 ms', 'p99 ms', 'peak MB')
+
+		for mode in args.modes.split(','):
+			output	= subprocess.check_output([sys.executable, os.path.abspath(__file__), '--child', mode, '--base', base,
+				'--calls', str(args.calls), '--workers', str(args.workers)])
+			result	= json.loads(output.strip().splitlines()[-1])
+			print '%-12s %8d %8d %10.1f %9.1f %9.1f %10.1f' % (mode, result['calls'], result['errors'], result['callsPerSec'], result['p50'], result['p99'], result['peakRSS'])
+	finally:
+		if server:
+			server.terminate()
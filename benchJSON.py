@@ -0,0 +1,97 @@
+# =============================================================================
+# benchJSON.py
+#
+# Micro-benchmark comparing the classic 'json.loads(response.text)' decode
+# path with jsonCodec decoding straight from the response bytes, on payloads
+# shaped like RUM raw data and raw monitor samples (HAR).
+#
+# Usage: python benchJSON.py [repeat]
+#
+# Version: 1.0
+# Date: 10/17/26
+# =============================================================================
+import sys
+import json
+import time
+import random
+import jsonCodec
+
+# -----------------------------------------------------------------------------
+# Build a RUM 'data/raw' response body with count samples.
+def rumPayload(count=20000):
+	rand	= random.Random(1)
+	items	= []
+
+	for x in range(count):
+		items.append({
+			'beaconId'			: 'b4e1f3c2a0d94e6f8a7b6c5d4e3f2a1b',
+			'timestamp'			: '2026-10-17T12:%02d:%02d.000Z' % (x / 60 % 60, x % 60),
+			'url'				: 'http://www.example.com/products/%d?ref=%s' % (rand.randint(1, 5000), 'x' * rand.randint(0, 40)),
+			'browser'			: rand.choice(['Chrome', 'Firefox', 'Safari', 'IE']),
+			'country'			: rand.choice(['US', 'GB', 'DE', 'JP', 'BR']),
+			'connection_type'	: rand.choice(['cable', 'dsl', 'mobile']),
+			'pageLoadTime'		: rand.randint(200, 20000),
+			'domReady'			: rand.randint(100, 9000),
+			'firstByte'			: rand.randint(20, 2000),
+			'jserrors'			: [u'TypeError: undefined is not a function \u2014 app.js:%d' % rand.randint(1, 900)] if rand.random() < 0.1 else [],
+		})
+
+	return json.dumps({'data': {'count': count, 'items': items}})
+
+# -----------------------------------------------------------------------------
+# Build a raw monitor sample (HAR) response body with count entries.
+def harPayload(count=400):
+	rand	= random.Random(2)
+	entries	= []
+
+	for x in range(count):
+		entries.append({
+			'startedDateTime'	: '2026-10-17T12:00:%02d.%03dZ' % (x % 60, x),
+			'time'				: rand.randint(5, 3000),
+			'request'			: {
+				'method'		: 'GET',
+				'url'			: 'http://cdn%d.example.com/static/asset_%d.js' % (x % 4, x),
+				'headers'		: [{'name': 'Header-%d' % h, 'value': 'v' * 30} for h in range(12)],
+			},
+			'response'			: {
+				'status'		: 200,
+				'bodySize'		: rand.randint(100, 500000),
+				'headers'		: [{'name': 'Header-%d' % h, 'value': 'v' * 30} for h in range(14)],
+				'content'		: {'mimeType': 'application/javascript', 'size': rand.randint(100, 500000)},
+			},
+			'timings'			: dict((k, rand.randint(0, 300)) for k in ('blocked', 'dns', 'connect', 'send', 'wait', 'receive')),
+		})
+
+	return json.dumps({'data': {'items': {'log': {'version': '1.2', 'entries': entries}}}})
+
+# -----------------------------------------------------------------------------
+# Time fn(body) and return the best of repeat runs in milliseconds.
+def timeIt(fn, body, repeat):
+	best = None
+
+	for x in range(repeat):
+		start	= time.time()
+		fn(body)
+		elapsed	= (time.time() - start) * 1000
+		best	= elapsed if best is None else min(best, elapsed)
+
+	return best
+
+# -----------------------------------------------------------------------------
+# Testing code
+if __name__ == '__main__':
+
+	repeat = int(sys.argv[1]) if len(sys.argv) > 1 else 5
+
+	for name, body in (('RUM raw data', rumPayload()), ('HAR sample', harPayload())):
+		print '**** %s: %.1f MB' % (name, len(body) / 1048576.0)
+
+		baseline = timeIt(lambda b: json.loads(b.decode('utf-8')), body, repeat)
+		print '%-28s %8.1f ms' % ('json.loads(response.text)', baseline)
+
+		for backend in sorted(jsonCodec.backends.keys()):
+			jsonCodec.setBackend(backend)
+			elapsed = timeIt(jsonCodec.loads, body, repeat)
+			print '%-28s %8.1f ms  (%.2fx)' % ('jsonCodec.loads [%s]' % backend, elapsed, baseline / elapsed)
+
+	jsonCodec.setBackend()
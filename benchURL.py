@@ -0,0 +1,73 @@
+# =============================================================================
+# benchURL.py
+#
+# Micro-benchmark of the per-call overhead of building a signed WPM API URL,
+# before (signature and query rebuilt from scratch on every call) and after
+# (cached service prefix, per-second signature and encoded parameters).
+#
+# Usage: python benchURL.py [--calls 100000]
+#
+# Version: 1.0
+# Date: 10/17/26
+# =============================================================================
+import md5
+import time
+import argparse
+import functools
+from client import Client, Request
+
+# -----------------------------------------------------------------------------
+# Build a URL the way Client.__constructURL did before any caching.
+def uncachedURL(client, request):
+	url = Client.wpmAPIBase + request.service + '/' + Client.wpmAPIVersion
+
+	if request.method:
+		url = url + '/' + request.method
+
+	url = url + '?apikey=' + client.key + '&sig=' + md5.new(client.key + client.secret + str(int(time.time())).encode('utf-8')).hexdigest()
+
+	if request.httpMethod == 'GET' and request.data:
+		url = url + "&" + "&".join("%s=%s" % item for item in request.data.items())
+
+	return url
+
+# -----------------------------------------------------------------------------
+# Get the microseconds per call of fn(request), best of a few runs.
+def timeCalls(fn, request, calls, runs=3):
+	best = None
+
+	for run in range(runs):
+		start = time.time()
+
+		for x in xrange(calls):
+			fn(request)
+
+		elapsed	= time.time() - start
+		best	= elapsed if best is None else min(best, elapsed)
+
+	return best * 1e6 / calls
+
+# -----------------------------------------------------------------------------
+# Run the benchmark.
+if __name__ == '__main__':
+
+	parser = argparse.ArgumentParser(description='Benchmark signed URL construction.')
+	parser.add_argument('--calls', type=int, default=100000)
+	args = parser.parse_args()
+
+	Client.debug	= 0
+	client			= Client('benchKey', 'benchSecret')
+	before			= functools.partial(uncachedURL, client)
+	after			= client._Client__constructURL
+	workloads		= (
+		('getMonitor', Request('monitor', '8a9a2f2b1f3c4d5e6f7a8b9c0d1e2f3a', 'GET')),
+		('getMonitorSamples', Request('monitor', '8a9a2f2b1f3c4d5e6f7a8b9c0d1e2f3a/sample', 'GET', {'startDate': '2026-10-01', 'endDate': '2026-10-17'})),
+		('getRawData', Request('rum', 'raw', 'GET', {'startDate': '2026-10-16 00:00', 'endDate': '2026-10-17 00:00', 'url': '.*/checkout/.*', 'jserr': 'Uncaught TypeError: .*', 'offset': 5000, 'limit': 1000})),
+	)
+
+	print '%-20s %12s %12s %9s' % ('call', 'before us', 'after us', 'speedup')
+
+	for name, request in workloads:
+		beforeUs	= timeCalls(before, request, args.calls)
+		afterUs		= timeCalls(after, request, args.calls)
+		print '%-20s %12.2f %12.2f %8.1fx' % (name, beforeUs, afterUs, beforeUs / afterUs)
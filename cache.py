@@ -0,0 +1,160 @@
+# =============================================================================
+# cache.py
+#
+# A size bounded, in-memory cache for responses to WPM API GET calls.
+#
+# Version: 1.0
+# Date: 10/17/26
+# =============================================================================
+import time
+import threading
+from collections import OrderedDict
+
+class ResponseCache:
+
+	# -------------------------------------------------------------------------
+	# Create a new ResponseCache object.
+	#
+	# maxEntries - Maximum number of responses kept (least recently used are evicted)
+	# ttl - Default number of seconds a response stays fresh
+	# ttls - Dictionary of TTL overrides keyed by service or (service, method)
+	#        (ex: {'monitor': 300, ('load', 'whoami'): 3600})
+	def __init__(self, maxEntries=256, ttl=60, ttls=None):
+		self.maxEntries	= maxEntries
+		self.ttl		= ttl
+		self.ttls		= ttls or {}
+		self.hits		= 0
+		self.misses		= 0
+		self.evictions	= 0
+		self.__entries	= OrderedDict()
+		self.__epoch	= 0			# Bumped when everything is invalidated
+		self.__generations = {}		# Service -> count of its invalidations
+		self.__lock		= threading.Lock()
+
+	# -------------------------------------------------------------------------
+	# Override string representation of ResponseCache object.
+	def __str__(self):
+		return '[%s: %s/%s, %s hits, %s misses]' % (self.__class__.__name__, len(self), self.maxEntries, self.hits, self.misses)
+
+	def __len__(self):
+		return len(self.__entries)
+
+	# -------------------------------------------------------------------------
+	# Get the number of seconds a response to request stays fresh.
+	def ttlFor(self, request):
+		ttl = self.ttls.get((request.service, request.method))
+
+		if ttl is None:
+			ttl = self.ttls.get(request.service, self.ttl)
+
+		return ttl
+
+	# -------------------------------------------------------------------------
+	# Get a fresh cached response for request (None if there isn't one).
+	def get(self, request):
+		key = request.key()
+
+		with self.__lock:
+			entry = self.__entries.pop(key, None)
+
+			if entry is None or entry[0] < time.time():
+				self.misses += 1
+				return None
+
+			self.__entries[key] = entry
+			self.hits += 1
+			return entry[1]
+
+	# -------------------------------------------------------------------------
+	# Get the invalidation generation of a service.  Taken before a read is
+	# sent and passed to put(), it keeps a response that a write may have
+	# overtaken out of the cache.
+	def generation(self, service):
+		with self.__lock:
+			return (self.__epoch, self.__generations.get(service, 0))
+
+	# -------------------------------------------------------------------------
+	# Store the response to request.
+	#
+	# generation - generation() of the service when the request was sent; if
+	#              the service has been invalidated since, nothing is stored
+	def put(self, request, response, generation=None):
+		ttl = self.ttlFor(request)
+
+		if ttl <= 0:
+			return
+
+		with self.__lock:
+			if generation is not None and generation != (self.__epoch, self.__generations.get(request.service, 0)):
+				return
+
+			self.__entries.pop(request.key(), None)
+			self.__entries[request.key()] = (time.time() + ttl, response, request.service)
+
+			while len(self.__entries) > self.maxEntries:
+				self.__entries.popitem(last=False)
+				self.evictions += 1
+
+	# -------------------------------------------------------------------------
+	# Drop cached responses.
+	#
+	# service - Only drop responses for this service (None drops everything)
+	def invalidate(self, service=None):
+		with self.__lock:
+			if service is None:
+				self.__epoch += 1
+				self.__entries.clear()
+				return
+
+			self.__generations[service] = self.__generations.get(service, 0) + 1
+
+			for key in [k for k, entry in self.__entries.items() if entry[2] == service]:
+				del self.__entries[key]
+
+	# -------------------------------------------------------------------------
+	# Get the cache counters.
+	def stats(self):
+		return {
+			'size'		: len(self),
+			'hits'		: self.hits,
+			'misses'	: self.misses,
+			'evictions'	: self.evictions,
+		}
+
+# -----------------------------------------------------------------------------
+# Testing code
+if __name__ == '__main__':
+
+	from tester import Tester
+	from monitor import Monitor
+
+	# Variables for testing
+	key		= Tester.wpmAPIKey
+	secret	= Tester.wpmAPISecret
+
+	# Test __init__
+	print '**** TEST: __init__'
+	cache			= ResponseCache(maxEntries=32, ttl=30, ttls={('monitor', 'locations'): 3600})
+	monitorClient	= Monitor(key, secret, cache=cache)
+	print cache
+
+	# Test hits
+	print '**** TEST: get'
+	monitorClient.getLocations()
+	monitorClient.listMonitors()
+	monitorClient.getLocations()
+	print cache.stats()
+
+	# Test invalidate on write
+	print '**** TEST: invalidate'
+	monitorClient.deleteMonitor('fakeMonitorId')
+	print cache.stats()
+
+	# Test a read overtaken by a write isn't stored
+	print '**** TEST: generation'
+	from client import Request
+	request		= Request('monitor', 'locations', 'GET')
+	generation	= cache.generation('monitor')
+	cache.invalidate('monitor')
+	cache.put(request, 'stale', generation)
+	print cache.get(request)
@@ -0,0 +1,157 @@
+# =============================================================================
+# cassette.py
+#
+# Record WPM API traffic to a compact on-disk cassette and replay it later
+# without any network I/O.  Calls are matched on Request.key() (service,
+# method, HTTP method & sorted parameters), so the time-varying signature
+# doesn't get in the way.
+#
+# Requires non-standard 'requests' python library to be installed.
+#
+# Version: 1.0
+# Date: 10/17/26
+# =============================================================================
+import os
+import gzip
+import json
+import base64
+import threading
+import requests
+from requests.structures import CaseInsensitiveDict
+
+# -----------------------------------------------------------------------------
+# Raised on replay when the cassette has no response for a call.
+class CassetteMiss(requests.RequestException):
+	pass
+
+class Cassette:
+
+	RECORD	= 'record'
+	REPLAY	= 'replay'
+
+	# -------------------------------------------------------------------------
+	# Create a new Cassette object.
+	#
+	# path - File to record to / replay from (gzip compressed JSON lines)
+	# mode - Cassette.RECORD or Cassette.REPLAY
+	def __init__(self, path, mode=REPLAY):
+		self.path		= path
+		self.mode		= mode
+		self.plays		= {}
+		self.responses	= {}
+		self.__file		= None
+		self.__lock		= threading.Lock()
+
+		if mode == Cassette.REPLAY:
+			self.load()
+		elif mode == Cassette.RECORD:
+			self.__file = gzip.open(path, 'ab')
+		else:
+			raise ValueError('Invalid cassette mode: %s' % mode)
+
+	# -------------------------------------------------------------------------
+	# Override string representation of Cassette object.
+	def __str__(self):
+		return '[%s: %s, %s, %s calls]' % (self.__class__.__name__, self.path, self.mode, sum(len(r) for r in self.responses.values()))
+
+	def __enter__(self):
+		return self
+
+	def __exit__(self, *excInfo):
+		self.close()
+
+	# -------------------------------------------------------------------------
+	# Read every recorded response into memory.
+	def load(self):
+		if not os.path.exists(self.path):
+			return
+
+		with gzip.open(self.path, 'rb') as cassetteFile:
+			for line in cassetteFile:
+				entry	= json.loads(line)
+				key		= tuple(entry['key'])
+				self.responses.setdefault(key, []).append(entry)
+
+	# -------------------------------------------------------------------------
+	# Write a finished response to the cassette.
+	#
+	# request - Request object describing the call
+	# response - Response received for it
+	def record(self, request, response):
+		if self.mode != Cassette.RECORD or response == '':
+			return
+
+		content	= response.content
+		entry	= {
+			'key'		: request.key(),
+			'status'	: response.status_code,
+			'headers'	: dict((k, v) for k, v in response.headers.items() if k.lower() not in ('content-encoding', 'content-length', 'transfer-encoding')),
+		}
+
+		try:
+			entry['body']	= content.decode('utf-8')
+		except UnicodeDecodeError:
+			entry['body64']	= base64.b64encode(content)
+
+		with self.__lock:
+			self.__file.write(json.dumps(entry, separators=(',', ':')) + '\n')
+			self.responses.setdefault(tuple(entry['key']), []).append(entry)
+
+	# -------------------------------------------------------------------------
+	# Build the Response recorded for a call.  Identical calls get their
+	# recorded responses in order; once those run out the last one repeats.
+	#
+	# request - Request object describing the call
+	def play(self, request):
+		key		= tuple(request.key())
+		entries	= self.responses.get(key)
+
+		if not entries:
+			raise CassetteMiss('No recorded response for %s' % (key,))
+
+		with self.__lock:
+			index			= self.plays.get(key, 0)
+			self.plays[key]	= index + 1
+
+		entry						= entries[min(index, len(entries) - 1)]
+		response					= requests.models.Response()
+		response.status_code		= entry['status']
+		response.headers			= CaseInsensitiveDict(entry['headers'])
+		response.encoding			= 'utf-8'
+		response._content			= entry['body'].encode('utf-8') if 'body' in entry else base64.b64decode(entry['body64'])
+		response._content_consumed	= True
+		response.reason				= 'Replayed'
+		return response
+
+	# -------------------------------------------------------------------------
+	# Flush and close a recording cassette.
+	def close(self):
+		with self.__lock:
+			if self.__file:
+				self.__file.close()
+				self.__file = None
+
+# -----------------------------------------------------------------------------
+# Testing code
+if __name__ == '__main__':
+
+	from tester import Tester
+	from monitor import Monitor
+
+	# Variables for testing
+	key		= Tester.wpmAPIKey
+	secret	= Tester.wpmAPISecret
+	path	= 'monitor.cassette'
+
+	# Test record
+	print '**** TEST: record'
+	with Cassette(path, Cassette.RECORD) as cassette:
+		monitorClient	= Monitor(key, secret, cassette=cassette)
+		monitors		= monitorClient.callItems('listMonitors')
+		print cassette
+
+	# Test replay
+	print '**** TEST: replay'
+	monitorClient	= Monitor(key, secret, cassette=Cassette(path))
+	print monitorClient.callItems('listMonitors') == monitors
+	os.remove(path)
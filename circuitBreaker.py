@@ -0,0 +1,212 @@
+# =============================================================================
+# circuitBreaker.py
+#
+# Per endpoint circuit breakers so a degraded WPM service fails fast instead
+# of tying up every worker waiting on it.
+#
+# Requires non-standard 'requests' python library to be installed.
+#
+# Version: 1.0
+# Date: 10/17/26
+# =============================================================================
+import time
+import threading
+import requests
+from collections import deque
+from metrics import Metrics
+
+# -----------------------------------------------------------------------------
+# Raised instead of calling an endpoint whose circuit is open.
+class CircuitOpenError(requests.RequestException):
+	pass
+
+class CircuitBreaker:
+
+	CLOSED		= 'CLOSED'
+	OPEN		= 'OPEN'
+	HALF_OPEN	= 'HALF_OPEN'
+
+	# -------------------------------------------------------------------------
+	# Create a new CircuitBreaker object.
+	#
+	# name - Name of the endpoint the breaker protects
+	# failureRate - Fraction of failed calls in the window that opens the circuit
+	# slowCall - Seconds after which a call counts as slow (None ignores latency)
+	# slowCallRate - Fraction of slow calls in the window that opens the circuit
+	# window - Number of most recent calls considered
+	# minCalls - Calls needed in the window before the circuit can open
+	# openTimeout - Seconds the circuit stays open before probing
+	# probes - Successful probe calls needed (while half-open) to close the circuit
+	# onStateChange - Function called with (name, oldState, newState)
+	def __init__(self, name, failureRate=0.5, slowCall=None, slowCallRate=0.8, window=20, minCalls=10, openTimeout=30, probes=1, onStateChange=None):
+		self.name			= name
+		self.failureRate	= failureRate
+		self.slowCall		= slowCall
+		self.slowCallRate	= slowCallRate
+		self.minCalls		= minCalls
+		self.openTimeout	= openTimeout
+		self.probes			= probes
+		self.onStateChange	= onStateChange
+		self.state			= CircuitBreaker.CLOSED
+		self.openedAt		= 0
+		self.__calls		= deque(maxlen=window)
+		self.__probing		= 0
+		self.__passed		= 0
+		self.__lock			= threading.Lock()
+
+	# -------------------------------------------------------------------------
+	# Override string representation of CircuitBreaker object.
+	def __str__(self):
+		return '[%s: %s, %s]' % (self.__class__.__name__, self.name, self.state)
+
+	# -------------------------------------------------------------------------
+	# Move to a new state.  Must be called holding the lock; returns the
+	# callback to run once the lock is released.
+	def __moveTo(self, state):
+		old				= self.state
+		self.state		= state
+		self.__probing	= 0
+		self.__passed	= 0
+
+		if state == CircuitBreaker.OPEN:
+			self.openedAt = time.time()
+		elif state == CircuitBreaker.CLOSED:
+			self.__calls.clear()
+
+		if self.onStateChange and old != state:
+			return lambda: self.onStateChange(self.name, old, state)
+
+	# -------------------------------------------------------------------------
+	# Decide whether a call may go ahead.  While half-open only a limited
+	# number of probe calls are let through at a time.
+	def allow(self):
+		notify = None
+
+		with self.__lock:
+			if self.state == CircuitBreaker.OPEN and time.time() - self.openedAt >= self.openTimeout:
+				notify = self.__moveTo(CircuitBreaker.HALF_OPEN)
+
+			if self.state == CircuitBreaker.CLOSED:
+				allowed = True
+			elif self.state == CircuitBreaker.HALF_OPEN and self.__probing < self.probes:
+				self.__probing += 1
+				allowed = True
+			else:
+				allowed = False
+
+		if notify:
+			notify()
+
+		return allowed
+
+	# -------------------------------------------------------------------------
+	# Give back a call that allow() let through but that was never sent (ex: it
+	# ran out of time waiting on a rate limiter), so it isn't counted.
+	def cancel(self):
+		with self.__lock:
+			if self.state == CircuitBreaker.HALF_OPEN and self.__probing > 0:
+				self.__probing -= 1
+
+	# -------------------------------------------------------------------------
+	# Record the outcome of a call that allow() let through.
+	#
+	# success - False if the call failed
+	# elapsed - Seconds the call took
+	def record(self, success, elapsed):
+		slow	= self.slowCall is not None and elapsed >= self.slowCall
+		notify	= None
+
+		with self.__lock:
+			if self.state == CircuitBreaker.HALF_OPEN:
+				self.__probing -= 1
+
+				if not success or slow:
+					notify = self.__moveTo(CircuitBreaker.OPEN)
+				else:
+					self.__passed += 1
+
+					if self.__passed >= self.probes:
+						notify = self.__moveTo(CircuitBreaker.CLOSED)
+
+			elif self.state == CircuitBreaker.CLOSED:
+				self.__calls.append((success, slow))
+				total = len(self.__calls)
+
+				if total >= self.minCalls:
+					failures	= sum(1 for ok, s in self.__calls if not ok)
+					slows		= sum(1 for ok, s in self.__calls if s)
+
+					if failures >= self.failureRate * total or (self.slowCall is not None and slows >= self.slowCallRate * total):
+						notify = self.__moveTo(CircuitBreaker.OPEN)
+
+		if notify:
+			notify()
+
+class CircuitBreakers:
+
+	# -------------------------------------------------------------------------
+	# Create a new CircuitBreakers object, handing out one CircuitBreaker per
+	# service (or per service & method).
+	#
+	# perMethod - Key breakers by service and method instead of just service
+	# settings - CircuitBreaker settings (failureRate, slowCall, openTimeout, onStateChange, ...)
+	def __init__(self, perMethod=False, **settings):
+		self.perMethod	= perMethod
+		self.settings	= settings
+		self.breakers	= {}
+		self.__lock		= threading.Lock()
+
+	# -------------------------------------------------------------------------
+	# Override string representation of CircuitBreakers object.
+	def __str__(self):
+		return '[%s: %s]' % (self.__class__.__name__, ', '.join(str(b) for b in self.breakers.values()))
+
+	# -------------------------------------------------------------------------
+	# Get the breaker protecting the endpoint of a Request.
+	def get(self, request):
+		name = request.service
+
+		if self.perMethod and request.method:
+			name = '%s/%s' % (name, Metrics.idPattern.sub(':id', request.method))
+
+		breaker = self.breakers.get(name)
+
+		if breaker is None:
+			with self.__lock:
+				breaker = self.breakers.setdefault(name, CircuitBreaker(name, **self.settings))
+
+		return breaker
+
+# -----------------------------------------------------------------------------
+# Testing code
+if __name__ == '__main__':
+
+	# Test opening, half-open probing and closing
+	print '**** TEST: CircuitBreaker'
+
+	def stateChange(name, old, new):
+		print 'State change:', name, old, '->', new
+
+	breaker = CircuitBreaker('rum', minCalls=4, openTimeout=0.2, onStateChange=stateChange)
+
+	for success in (True, False, False, True):
+		breaker.allow()
+		breaker.record(success, 0.1)
+
+	print breaker, breaker.allow()
+	time.sleep(0.25)
+	print breaker.allow(), breaker.allow()
+	breaker.cancel()
+	print breaker.allow()
+	breaker.record(True, 0.1)
+	print breaker
+
+	# Test slow calls
+	print '**** TEST: slow calls'
+	breaker = CircuitBreaker('monitor', slowCall=1.0, minCalls=2, onStateChange=stateChange)
+
+	for x in range(2):
+		breaker.allow()
+		breaker.record(True, 2.0)
+
+	print breaker
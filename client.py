@@ -9,11 +9,53 @@
 # Date: 02/11/13
 # Author: Tyler Fullerton
 # =============================================================================
+import re
 import md5
+import zlib
 import time
 import json
 import string
+import urllib
+import logging
 import requests
+import threading
+import jsonCodec
+import jsonStream
+from collections import namedtuple
+from transport import Transport
+from singleFlight import SingleFlight
+from circuitBreaker import CircuitOpenError
+from deadline import Deadline, DeadlineExceeded
+from executor import Executor, wait
+
+log = logging.getLogger('wpm.client')
+log.addHandler(logging.NullHandler())
+
+# -----------------------------------------------------------------------------
+# An immutable description of a single API call.  Service methods build one
+# per call so nothing about the call is stored on the Client object.
+#
+# service - API service to perform (monitor, load, rum, tools, maintenance)
+# method - API method to perform (beacon, instanttest, list, etc.)
+# httpMethod - HTTP method required by the API service/method (POST, GET, PUT, DELETE)
+# data - GET parameters, or the body for a POST or a PUT
+class Request(namedtuple('Request', 'service method httpMethod data')):
+
+	__slots__ = ()
+
+	def __new__(cls, service, method='', httpMethod='GET', data=''):
+		return super(Request, cls).__new__(cls, service, method, string.upper(httpMethod), data)
+
+	# -------------------------------------------------------------------------
+	# Get a hashable key identifying the call (parameters in sorted order).
+	def key(self):
+		items = sorted(self.data.items()) if isinstance(self.data, dict) else self.data
+		return (self.service, self.method, self.httpMethod, repr(items))
+
+# -----------------------------------------------------------------------------
+# The outcome of one call in a batch: the response, or the error it raised.
+CallResult = namedtuple('CallResult', 'value error')
+
 
 class Client:
 
@@ -21,6 +63,13 @@ class Client:
 	wpmAPIVersion	= '1.0'
 
 	debug			= 1
+
+	connectTimeout	= 10		# Seconds to wait for a connection
+	readTimeout		= 120		# Seconds to wait between bytes of a response
+
+	__prefixes		= {}		# URL prefix per (base, version, service)
+	__signatures	= {}		# (second, signature) per (key, secret)
+	__queryParts	= {}		# Encoded query per GET parameter set & 'name=value' per parameter
 	
 	# -------------------------------------------------------------------------
 	# Create a new Client object.
@@ -30,12 +79,45 @@ class Client:
 	# service - API service to perform (monitor, load, rum, tools, maintenance)
 	# method - API method to perform (beacon, instanttest, list, etc.)
 	# httpMethod - HTTP method required by the API service/method (POST, GET, PUT, DELETE)
-	def __init__(self, key, secret, service='', method='', httpMethod='GET'):
+	# transport - Pooled Transport to send requests over (defaults to the shared Transport)
+	# cache - ResponseCache for GET responses (None disables caching)
+	# coalesce - Share one response between identical in-flight GETs (True or a SingleFlight)
+	# limiter - RateLimiter applied before every request (None is unlimited)
+	# retry - RetryPolicy for failed requests (None never retries)
+	# compress - Compress POST/PUT bodies of at least this many bytes (None disables)
+	# compressEncoding - Request body compression to use ('gzip' or 'deflate')
+	# metrics - Metrics object to record every call in (None disables instrumentation)
+	# cassette - Cassette to record responses to, or replay them from instead of the network
+	# breakers - CircuitBreakers failing calls fast while an endpoint is degraded (None disables)
+	# connectTimeout - Seconds to wait for a connection (defaults to Client.connectTimeout)
+	# readTimeout - Seconds to wait between bytes of a response (defaults to Client.readTimeout)
+	# hedge - HedgePolicy racing a second request against slow GETs (None disables)
+	# concurrency - AdaptiveLimiter bounding the requests in flight (None is unbounded)
+	# scheduler - PriorityScheduler admitting requests by priority lane (None is first come, first served)
+	# priority - Lane of this client's requests in the scheduler (interactive, normal, bulk)
+	def __init__(self, key, secret, service='', method='', httpMethod='GET', transport=None, cache=None, coalesce=None, limiter=None, retry=None, compress=None, compressEncoding='gzip', metrics=None, cassette=None, breakers=None, connectTimeout=None, readTimeout=None, hedge=None, concurrency=None, scheduler=None, priority='normal'):
 		self.key		= key.encode('utf-8')
 		self.secret		= secret.encode('utf-8')
 		self.service	= service
 		self.method		= method
 		self.httpMethod	= string.upper(httpMethod)
+		self.transport	= transport or Transport.default()
+		self.cache		= cache
+		self.coalesce	= SingleFlight() if coalesce is True else coalesce or None
+		self.limiter	= limiter
+		self.retry		= retry
+		self.compress	= compress
+		self.compressEncoding = compressEncoding
+		self.metrics	= metrics
+		self.cassette	= cassette
+		self.breakers	= breakers
+		self.connectTimeout	= connectTimeout or Client.connectTimeout
+		self.readTimeout	= readTimeout or Client.readTimeout
+		self.hedge		= hedge
+		self.concurrency = concurrency
+		self.scheduler	= scheduler
+		self.priority	= priority
+		self.__local	= threading.local()
 
 	# -------------------------------------------------------------------------
 	# Override string representation of Client object.
@@ -45,43 +127,140 @@ class Client:
 	# -------------------------------------------------------------------------
 	# Perform an HTTP DELETE. 
 	def __doDelete(self, url):
-		return requests.delete(url)
+		return self.transport.request('DELETE', url, timeout=self.__timeout())
 
 	# -------------------------------------------------------------------------
 	# Perform an HTTP GET.
-	def __doGet(self, url):
-		return requests.get(url)		
+	#
+	# stream - Leave the body unread so it can be consumed incrementally
+	def __doGet(self, url, stream=False):
+		return self.transport.request('GET', url, stream=stream, timeout=self.__timeout())
 
 	# -------------------------------------------------------------------------
 	# Perform an HTTP POST.
 	def __doPost(self, url, data):
-		return requests.post(url, data=json.dumps(data), headers={'Content-Type':'application/json'})
+		body, headers, size = self.__encodeBody(data)
+		response = self.transport.request('POST', url, data=body, headers=headers, timeout=self.__timeout())
+		response.sentDecoded = size
+		return response
 
 	# -------------------------------------------------------------------------
 	# Perform an HTTP PUT.
 	def __doPut(self, url, data):
-		return requests.put(url, data=json.dumps(data), headers={'Content-Type':'application/json'})
+		body, headers, size = self.__encodeBody(data)
+		response = self.transport.request('PUT', url, data=body, headers=headers, timeout=self.__timeout())
+		response.sentDecoded = size
+		return response
 
 	# -------------------------------------------------------------------------
-	# Construct URL.
-	def __constructURL(self, data=''):
+	# Get the (connect, read) timeouts for a request, cut down to the time
+	# left on the thread's Deadline.
+	def __timeout(self):
+		deadline = Deadline.current()
 
-		url = Client.wpmAPIBase + self.service + '/' + Client.wpmAPIVersion
-		
-		if self.method:
-			url = url + '/' + self.method
+		if deadline is None:
+			return (self.connectTimeout, self.readTimeout)
 
-		
-		url = url + '?apikey=' + self.key + '&sig=' + self.signature() 
+		deadline.check()
+		remaining = deadline.remaining()
+		return (min(self.connectTimeout, remaining), min(self.readTimeout, remaining))
+
+	# -------------------------------------------------------------------------
+	# Serialize a POST/PUT body, compressing it if it's large enough.
+	#
+	# Returns a (body, headers, uncompressed size) tuple.
+	def __encodeBody(self, data):
+		body	= jsonCodec.dumps(data)
+		size	= len(body)
+		headers	= {'Content-Type':'application/json'}
+
+		if self.compress is not None and size >= self.compress:
+			if self.compressEncoding == 'deflate':
+				body = zlib.compress(body)
+			else:
+				gzip = zlib.compressobj(6, zlib.DEFLATED, 16 + zlib.MAX_WBITS)
+				body = gzip.compress(body) + gzip.flush()
+
+			headers['Content-Encoding'] = self.compressEncoding
+
+		return body, headers, size
+
+	# -------------------------------------------------------------------------
+	# Record the byte counts of a finished response on the response itself
+	# (sentWire, sentDecoded, receivedWire, receivedDecoded) and in the
+	# transport's TransferStats.
+	#
+	# decoded - Decoded body size, for streamed responses that were consumed
+	def __countBytes(self, response, decoded=None):
+		sent						= len(getattr(response.request, 'body', None) or '')
+		response.sentWire			= sent
+		response.sentDecoded		= getattr(response, 'sentDecoded', sent)
+		response.receivedDecoded	= len(response.content) if decoded is None else decoded
+		response.receivedWire		= response.raw.tell() if hasattr(response.raw, 'tell') else response.receivedDecoded
+
+		self.transport.stats.record(response.sentWire, response.sentDecoded, response.receivedWire, response.receivedDecoded)
+
+	# -------------------------------------------------------------------------
+	# Construct URL.  The service prefix, the signature (per second) and the
+	# encoding of each GET parameter are cached, as bulk callers build many
+	# URLs that differ only in a method ID or a parameter or two.
+	#
+	# request - Request object describing the call
+	def __constructURL(self, request):
+		key		= (Client.wpmAPIBase, Client.wpmAPIVersion, request.service)
+		prefix	= Client.__prefixes.get(key)
+
+		if prefix is None:
+			prefix = Client.__prefixes[key] = Client.wpmAPIBase + request.service + '/' + Client.wpmAPIVersion
+
+		if request.method:
+			prefix = prefix + '/' + request.method
+
+		url = prefix + '?apikey=' + self.key + '&sig=' + self.signature()
 
 		# Attach additional parameters for GET requests
-		if self.httpMethod == 'GET' and data:
-			url = url + "&" + "&".join("%s=%s" % item for item in data.items())
+		if request.httpMethod == 'GET' and request.data:
+			url = url + '&' + self.__encodeQuery(request.data)
 
-		if self.debug:
-			print 'URL:', url
+		if self.debug and log.isEnabledFor(logging.DEBUG):
+			log.debug('URL: %s', re.sub(r'(apikey|sig)=[^&]*', r'\1=<redacted>', url))
 		
 		return url
+
+	# -------------------------------------------------------------------------
+	# URL encode GET parameters (UTF-8).  Whole query strings are reused for
+	# repeated parameter sets, and single 'name=value' pairs for sets that
+	# differ only a little (ex: paging with a new offset).  Values are cached
+	# with their type, as equal values like 1, 1.0 & True encode differently.
+	def __encodeQuery(self, data):
+		encoded = Client.__queryParts
+		items	= tuple((name, value.__class__, value) for name, value in data.items())
+
+		if len(encoded) > 4096:
+			encoded.clear()
+
+		try:
+			query = encoded.get(items)
+		except TypeError:
+			items = tuple((name, valueType, value if isinstance(value, basestring) else str(value)) for name, valueType, value in items)
+			query = encoded.get(items)
+
+		if query is not None:
+			return query
+
+		parts = []
+
+		for item in items:
+			part = encoded.get(item)
+
+			if part is None:
+				name, value	= [v.encode('utf-8') if isinstance(v, unicode) else str(v) for v in (item[0], item[2])]
+				part		= encoded[item] = urllib.quote_plus(name) + '=' + urllib.quote_plus(value)
+
+			parts.append(part)
+
+		query = encoded[items] = '&'.join(parts)
+		return query
 	
 	# =========================================================================
 	# Setters for Instance variables.
@@ -100,37 +279,525 @@ class Client:
 	def setHttpMethod(self, httpMethod):
 		self.httpMethod = string.upper(httpMethod)
 
+	def setTransport(self, transport):
+		self.transport = transport
+
+	def setCache(self, cache):
+		self.cache = cache
+
+	def setCoalesce(self, coalesce):
+		self.coalesce = SingleFlight() if coalesce is True else coalesce or None
+
+	def setLimiter(self, limiter):
+		self.limiter = limiter
+
+	def setRetry(self, retry):
+		self.retry = retry
+
+	def setMetrics(self, metrics):
+		self.metrics = metrics
+
+	def setCassette(self, cassette):
+		self.cassette = cassette
+
+	def setBreakers(self, breakers):
+		self.breakers = breakers
+
+	def setTimeouts(self, connectTimeout, readTimeout):
+		self.connectTimeout	= connectTimeout
+		self.readTimeout	= readTimeout
+
+	def setHedge(self, hedge):
+		self.hedge = hedge
+
+	def setConcurrency(self, concurrency):
+		self.concurrency = concurrency
+
+	def setScheduler(self, scheduler, priority='normal'):
+		self.scheduler	= scheduler
+		self.priority	= priority
+
+	def setCompress(self, compress, compressEncoding='gzip'):
+		self.compress			= compress
+		self.compressEncoding	= compressEncoding
+
 	# -------------------------------------------------------------------------
-	# Create a signature for API calls.
+	# Create a signature for API calls.  It only changes once a second, so the
+	# last one made for each key & secret is shared by every Client.
 	def signature(self):
-		return md5.new(self.key + self.secret + str(int(time.time())).encode('utf-8')).hexdigest()
+		now		= int(time.time())
+		signed	= Client.__signatures.get((self.key, self.secret))
+
+		if signed is None or signed[0] != now:
+			signed = (now, md5.new(self.key + self.secret + str(now).encode('utf-8')).hexdigest())
+			Client.__signatures[(self.key, self.secret)] = signed
+
+		return signed[1]
 
 	# -------------------------------------------------------------------------
-	# Marshall the call to the API.
-	# 
-	# data - parameter should be provided when performing a POST or a PUT
-	def call(self, data=''):
-		url		= self.__constructURL(data)		
-		results = ''
-		
+	# Perform the HTTP exchange for a Request, or replay it from the cassette.
+	#
+	# stream - Leave the body of a GET unread so it can be consumed incrementally
+	def __transfer(self, request, stream=False):
+		if self.cassette is None:
+			return self.__attempt(request, stream)
+
+		if self.cassette.mode == self.cassette.REPLAY:
+			return self.cassette.play(request)
+
+		results = self.__attempt(request, stream)
+		self.cassette.record(request, results)
+		return results
+
+	# -------------------------------------------------------------------------
+	# Perform the HTTP exchange for a Request, rate limited and retried as
+	# configured.  The URL is rebuilt on each attempt to get a fresh signature.
+	def __attempt(self, request, stream=False):
+		attempt = 0
+
+		while True:
+			try:
+				results = self.__once(request, stream)
+			except requests.RequestException as e:
+				if self.retry is None or not self.retry.shouldRetry(request, attempt, error=e):
+					raise
+
+				delay = self.retry.delay(attempt)
+
+				if delay is None or not self.__fits(delay):
+					raise
+			else:
+				delay = None
+
+				if self.retry is not None and self.retry.shouldRetry(request, attempt, response=results):
+					delay = self.retry.delay(attempt, results)
+
+				if delay is None or not self.__fits(delay):
+					if attempt:
+						results.retries = attempt
+					return results
+
+				# Give the connection of a streamed response back to the pool
+				results.close()
+
+			attempt += 1
+			time.sleep(delay)
+
+	# -------------------------------------------------------------------------
+	# Check a retry delay leaves time before the thread's Deadline.
+	def __fits(self, delay):
+		deadline = Deadline.current()
+		return deadline is None or delay < deadline.remaining()
+
+	# -------------------------------------------------------------------------
+	# Perform one attempt at a Request, hedged if it's slow and hedging is on.
+	def __once(self, request, stream):
+		if self.hedge is None or not self.hedge.applies(request):
+			return self.__guarded(request, stream)
+
+		return self.hedge.race(request, self.__guarded, stream)
+
+	# -------------------------------------------------------------------------
+	# Wait for the rate limiter, but no longer than the thread's Deadline allows.
+	def __throttle(self, request):
+		deadline = Deadline.current()
+
+		if not self.limiter.acquire(request.service, deadline and deadline.remaining()):
+			raise DeadlineExceeded('Deadline of %s seconds exceeded waiting on the rate limiter' % deadline.seconds)
+
+	# -------------------------------------------------------------------------
+	# Perform one attempt at a Request behind its endpoint's circuit breaker.
+	# Calls to an open circuit raise CircuitOpenError without waiting on the
+	# limiters.  Only the network exchange counts towards the breaker, so
+	# waiting on the limiters (or running out of time doing so) doesn't make
+	# a healthy endpoint look slow or failing.
+	def __guarded(self, request, stream):
+		if self.breakers is None:
+			return self.__limited(request, stream, None)
+
+		breaker = self.breakers.get(request)
+
+		if not breaker.allow():
+			raise CircuitOpenError('Circuit open for %s' % breaker.name)
+
 		try:
-			if self.httpMethod == 'GET':
-				results = self.__doGet(url)
-			elif self.httpMethod == 'POST':			
-				results = self.__doPost(url, data)
-			elif self.httpMethod == 'DELETE':
-				results = self.__doDelete(url)
-			elif self.httpMethod == 'PUT':
-				results = self.__doPut(url, data)
+			return self.__limited(request, stream, breaker)
+		except DeadlineExceeded:
+			breaker.cancel()
+			raise
+
+	# -------------------------------------------------------------------------
+	# Perform one attempt at a Request once the scheduler and the rate limiter
+	# let it through.  With a scheduler, waiting on the rate limiter is part
+	# of admission, so the quota is handed out in priority order.
+	def __limited(self, request, stream, breaker):
+		if self.scheduler is None:
+			if self.limiter is not None:
+				self.__throttle(request)
+
+			return self.__bounded(request, stream, breaker)
+
+		deadline = Deadline.current()
+
+		if not self.scheduler.acquire(self.priority, deadline and deadline.remaining(), self.limiter and (lambda: self.__throttle(request))):
+			raise DeadlineExceeded('Deadline of %s seconds exceeded waiting on the scheduler' % deadline.seconds)
+
+		try:
+			return self.__bounded(request, stream, breaker)
+		finally:
+			self.scheduler.release()
+
+	# -------------------------------------------------------------------------
+	# Perform one attempt at a Request within the adaptive concurrency limit.
+	# The outcome feeds back into the limit, unless the call ran out of the
+	# caller's time rather than the API's: DeadlineExceeded, or a timeout
+	# that the Deadline cut shorter than the configured one.
+	def __bounded(self, request, stream, breaker):
+		if self.concurrency is None:
+			return self.__recorded(request, stream, breaker)
+
+		deadline = Deadline.current()
+
+		if not self.concurrency.acquire(deadline and deadline.remaining()):
+			raise DeadlineExceeded('Deadline of %s seconds exceeded waiting on the concurrency limit' % deadline.seconds)
+
+		start	= time.time()
+		results	= error = None
+
+		try:
+			results = self.__recorded(request, stream, breaker)
+			return results
+		except Exception as error:
+			raise
+		finally:
+			if self.__callerTimeout(error, deadline, start):
+				self.concurrency.cancel()
 			else:
-				print 'Invalid httpMethod', self.httpMethod
+				self.concurrency.release(time.time() - start, results, error)
+
+			if self.metrics is not None:
+				self.metrics.gauge('concurrency_limit', (), int(self.concurrency.limit))
+
+	# -------------------------------------------------------------------------
+	# Decide whether an error is the caller's Deadline running out.
+	#
+	# start - When the exchange started
+	def __callerTimeout(self, error, deadline, start):
+		if isinstance(error, DeadlineExceeded):
+			return True
+
+		if not isinstance(error, requests.Timeout) or deadline is None:
+			return False
+
+		timeout = self.connectTimeout if isinstance(error, requests.ConnectTimeout) else self.readTimeout
+		return deadline.expires - start < timeout
+
+	# -------------------------------------------------------------------------
+	# Perform a single HTTP exchange for a Request, recording its outcome and
+	# time with the circuit breaker.  DeadlineExceeded is raised before
+	# anything is sent, so it is left for __guarded() to give back.
+	def __recorded(self, request, stream, breaker):
+		if breaker is None:
+			return self.__exchange(request, stream)
+
+		start = time.time()
+
+		try:
+			results = self.__exchange(request, stream)
+		except DeadlineExceeded:
+			raise
+		except Exception:
+			breaker.record(False, time.time() - start)
+			raise
+
+		breaker.record(getattr(results, 'status_code', 0) < 500, time.time() - start)
+		return results
+
+	# -------------------------------------------------------------------------
+	# Perform a single HTTP exchange for a Request.
+	def __exchange(self, request, stream=False):
+		url		= self.__constructURL(request)
+		results = ''
+
+		if request.httpMethod == 'GET':
+			results = self.__doGet(url, stream)
+		elif request.httpMethod == 'POST':
+			results = self.__doPost(url, request.data)
+		elif request.httpMethod == 'DELETE':
+			results = self.__doDelete(url)
+		elif request.httpMethod == 'PUT':
+			results = self.__doPut(url, request.data)
+		else:
+			log.error('Invalid httpMethod %s', request.httpMethod)
+
+		if results != '' and not stream:
+			self.__countBytes(results)
+
+		return results
+
+	# -------------------------------------------------------------------------
+	# Fetch a GET Request that wasn't answered from the cache.
+	def __fetch(self, request):
+		if self.cache is None:
+			return self.__transfer(request)
+
+		generation	= self.cache.generation(request.service)
+		results		= self.__transfer(request)
+
+		if getattr(results, 'ok', False):
+			self.cache.put(request, results, generation)
+
+		return results
+
+	# -------------------------------------------------------------------------
+	# Send a Request to the API.  Unlike call(), errors are raised to the caller.
+	#
+	# request - Request object describing the call
+	def send(self, request):
+		if self.metrics is None:
+			return self.__send(request)
+
+		start					= time.time()
+		self.__local.cacheHit	= False
+
+		try:
+			results = self.__send(request)
+		except Exception as e:
+			self.metrics.record(request, time.time() - start, error=e)
+			raise
+
+		self.metrics.record(request, time.time() - start, results, cacheHit=self.__local.cacheHit)
+		return results
+
+	# -------------------------------------------------------------------------
+	# Answer a Request from the cache, a coalesced call, or the network.
+	def __send(self, request):
+		if request.httpMethod != 'GET':
+			if self.cache is None:
+				return self.__transfer(request)
+
+			# Write-through: drop cached reads for the service on both sides
+			# of the write.  Each invalidate() also moves the service to a new
+			# generation, so a read sent before the write ended isn't cached
+			# however late its response arrives.
+			self.cache.invalidate(request.service)
+
+			try:
+				return self.__transfer(request)
+			finally:
+				self.cache.invalidate(request.service)
+
+		if self.cache is not None:
+			results = self.cache.get(request)
+
+			if results is not None:
+				self.__local.cacheHit = True
+				return results
+
+		if self.coalesce is not None:
+			return self.coalesce.do(request.key(), self.__fetch, request)
+
+		return self.__fetch(request)
+
+	# -------------------------------------------------------------------------
+	# Send a Request and return its parsed JSON payload.  The body is decoded
+	# straight from the response bytes with the fastest installed JSON backend.
+	#
+	# request - Request object describing the call
+	def sendJSON(self, request):
+		content = self.send(request).content
+
+		if self.metrics is None:
+			return jsonCodec.loads(content)
+
+		start	= time.time()
+		payload	= jsonCodec.loads(content)
+		self.metrics.recordDecode(request, time.time() - start)
+		return payload
+
+	# -------------------------------------------------------------------------
+	# Call an API method and return its parsed JSON payload.
+	#
+	# name - Name of the API method (ex: 'getMonitor')
+	# args - Arguments for the API method
+	def callJSON(self, name, *args, **kwargs):
+		return self.sendJSON(self.prepare(name, *args, **kwargs))
+
+	# -------------------------------------------------------------------------
+	# Call an API method and return the 'items' of its payload's 'data'.
+	#
+	# name - Name of the API method (ex: 'listMonitors')
+	# args - Arguments for the API method
+	def callItems(self, name, *args, **kwargs):
+		return (self.callJSON(name, *args, **kwargs).get('data') or {}).get('items', [])
+
+	# -------------------------------------------------------------------------
+	# Stream the response to a GET Request and yield the elements of its items
+	# array one at a time, without holding the whole body in memory.  The
+	# cache and coalescing are bypassed.  Errors are raised to the caller.
+	#
+	# request - Request object describing the call
+	# chunkSize - Number of bytes read from the socket at a time
+	# path - Keys leading to the array in the response
+	def iterItems(self, request, chunkSize=65536, path=('data', 'items')):
+		start		= time.time()
+		response	= self.__transfer(request, stream=True)
+		decoded		= [0]
+
+		def chunks():
+			for chunk in response.iter_content(chunkSize):
+				decoded[0] += len(chunk)
+				yield chunk
+
+		try:
+			response.raise_for_status()
+
+			for item in jsonStream.iterItems(chunks(), path):
+				yield item
+		finally:
+			self.__countBytes(response, decoded[0])
+			response.close()
+
+			if self.metrics is not None:
+				self.metrics.record(request, time.time() - start, response)
+
+	# -------------------------------------------------------------------------
+	# Stream the response to a GET Request into a file-like object, without
+	# holding the whole body in memory.  The cache and coalescing are
+	# bypassed.  Errors are raised to the caller.
+	#
+	# request - Request object describing the call
+	# fileobj - Object with a write() method receiving the (decoded) body
+	# chunkSize - Bytes to read at a time
+	def download(self, request, fileobj, chunkSize=65536):
+		start		= time.time()
+		response	= self.__transfer(request, stream=True)
+		decoded		= 0
+
+		try:
+			response.raise_for_status()
+
+			for chunk in response.iter_content(chunkSize):
+				decoded += len(chunk)
+				fileobj.write(chunk)
+		finally:
+			self.__countBytes(response, decoded)
+			response.close()
+
+			if self.metrics is not None:
+				self.metrics.record(request, time.time() - start, response)
+
+		return response
+
+	# -------------------------------------------------------------------------
+	# Send a Request to the API, reporting errors and returning '' on failure.
+	#
+	# request - Request object describing the call
+	def dispatch(self, request):
+		results = ''
+
+		try:
+			results = self.send(request)
 		except requests.RequestException as e:
-			print 'Client error:', str(e)
+			log.error('Client error: %s', e)
 		except requests.Timeout as e:
-			print 'Request timeout:', str(e)
+			log.error('Request timeout: %s', e)
 			
 		return results
 
+	# -------------------------------------------------------------------------
+	# Build a Request for an API call and dispatch it.  This is what the
+	# service methods use, so a single Client can be shared between threads.
+	#
+	# service - API service to perform
+	# method - API method to perform
+	# httpMethod - HTTP method required by the API service/method
+	# data - parameter should be provided when performing a POST or a PUT
+	def perform(self, service, method, httpMethod, data=''):
+		request = Request(service, method, httpMethod, data)
+
+		if getattr(self.__local, 'preparing', False):
+			return request
+
+		return self.dispatch(request)
+
+	# -------------------------------------------------------------------------
+	# Get the Request an API method would send, without sending it.
+	#
+	# name - Name of the API method (ex: 'getMonitor')
+	# args - Arguments for the API method
+	def prepare(self, name, *args, **kwargs):
+		self.__local.preparing = True
+
+		try:
+			return getattr(self, name)(*args, **kwargs)
+		finally:
+			self.__local.preparing = False
+
+	# -------------------------------------------------------------------------
+	# Send one entry of a callMany batch, within the batch's deadline.
+	def __sendCall(self, call, deadline):
+		if not isinstance(call, Request):
+			name, args, kwargs = (tuple(call) + ({},))[:3]
+			call = self.prepare(name, *args, **kwargs)
+
+		return Deadline.within(deadline, self.send, call)
+
+	# -------------------------------------------------------------------------
+	# Send a batch of calls concurrently.
+	#
+	# calls - List of Request objects or (name, args) / (name, args, kwargs) tuples
+	# workers - Maximum number of calls in flight
+	# deadline - Seconds the whole batch may take (None waits forever)
+	# executor - Executor to run the calls on (defaults to a new one for the batch)
+	#
+	# Returns a list of CallResult objects in the same order as calls.  A call
+	# that fails, or doesn't finish before the deadline, has its error set.
+	# Each call only gets the time left on the batch (or enclosing) Deadline.
+	def callMany(self, calls, workers=8, deadline=None, executor=None):
+		pool	= executor or Executor(min(workers, len(calls)) or 1, 'wpm-batch')
+		batch	= Deadline.current()
+		futures	= []
+
+		if deadline is not None and (batch is None or deadline < batch.remaining()):
+			batch = Deadline(deadline)
+
+		for call in calls:
+			futures.append(pool.submit(self.__sendCall, call, batch))
+
+		wait(futures, batch and batch.remaining())
+		results = []
+
+		for future in futures:
+			if future.done():
+				error = future.exception()
+				results.append(CallResult(None if error else future.result(), error))
+			else:
+				future.cancel()
+				results.append(CallResult(None, DeadlineExceeded('Batch deadline of %s seconds exceeded' % batch.seconds)))
+
+		if not executor:
+			pool.shutdown(wait=False)
+
+		return results
+
+	# -------------------------------------------------------------------------
+	# Call one API method concurrently for each set of arguments.
+	#
+	# name - Name of the API method (ex: 'getMonitorSummary')
+	# argsList - List of arguments; a tuple is used as the full argument list
+	# options - Passed to callMany (workers, deadline, executor)
+	def map(self, name, argsList, **options):
+		return self.callMany([(name, args if isinstance(args, tuple) else (args,)) for args in argsList], **options)
+
+	# -------------------------------------------------------------------------
+	# Marshall the call to the API using the service, method & httpMethod set
+	# on this object.
+	# 
+	# data - parameter should be provided when performing a POST or a PUT
+	def call(self, data=''):
+		return self.perform(self.service, self.method, self.httpMethod, data)
+
 # -----------------------------------------------------------------------------
 # Testing code
 if __name__ == '__main__':
@@ -195,14 +862,25 @@ if __name__ == '__main__':
 	client3.setService('monitor')
 	client3.setHttpMethod('get')
 	client3.setMethod('locations')
-	print client3._Client__constructURL()
+	print client3._Client__constructURL(Request('monitor', 'locations', 'get'))
 
 	# And...Test __constructURL with parameters
 	print '**** TEST: __constructURL (with params)'
 	client3.setService('monitor')
 	client3.setHttpMethod('get')
 	client3.setMethod('locations')
-	print client3._Client__constructURL({'key1':'value1','key2':'value2'})
+	print client3._Client__constructURL(Request('monitor', 'locations', 'get', {'key1':'value1','key2':'value2'}))
+	print [client3._Client__encodeQuery({'offset': value}) for value in (1, True, 1.0)]
+
+	# Test send
+	print '**** TEST: send'
+	print client3.send(Request('monitor', 'locations', 'GET')).text
+
+	# Test callMany
+	print '**** TEST: callMany'
+	calls	= [Request('monitor', 'locations', 'GET'), Request('monitor', '', 'GET')]
+	for result in client3.callMany(calls, deadline=30):
+		print result.error or result.value.status_code
 	
 	# Test __doPost
 	print '**** TEST: __doPost'
@@ -210,7 +888,7 @@ if __name__ == '__main__':
 	client3.setHttpMethod('POST')
 	client3.setMethod('')
 	print client3
-	rsp		= client3._Client__doPost(client3._Client__constructURL(), params)
+	rsp		= client3._Client__doPost(client3._Client__constructURL(Request('monitor', '', 'POST')), params)
 	jsonObj = json.loads(rsp.text)
 	svcID	= jsonObj.get('data', {}).get('items', {}).get('id', '')
 	print rsp.text	
@@ -221,7 +899,7 @@ if __name__ == '__main__':
 	client3.setHttpMethod('get')
 	client3.setMethod(svcID)
 	print client3
-	rsp		= client3._Client__doGet(client3._Client__constructURL())
+	rsp		= client3._Client__doGet(client3._Client__constructURL(Request('monitor', svcID, 'GET')))
 	print rsp.text
 
 	# Test __doPut
@@ -230,7 +908,7 @@ if __name__ == '__main__':
 	client3.setHttpMethod('put')
 	client3.setMethod(svcID)
 	print client3
-	rsp		= client3._Client__doPut(client3._Client__constructURL(), uParams)
+	rsp		= client3._Client__doPut(client3._Client__constructURL(Request('monitor', svcID, 'PUT')), uParams)
 	print rsp.text
 
 	# Test __doDelete
@@ -239,5 +917,5 @@ if __name__ == '__main__':
 	client3.setHttpMethod('delete')
 	client3.setMethod(svcID)
 	print client3
-	rsp		= client3._Client__doDelete(client3._Client__constructURL())
+	rsp		= client3._Client__doDelete(client3._Client__constructURL(Request('monitor', svcID, 'DELETE')))
 	print rsp.text
@@ -0,0 +1,144 @@
+# =============================================================================
+# concurrencyLimiter.py
+#
+# Adaptive limit on the number of WPM API calls in flight.  The limit grows
+# while latency holds steady and is cut back when latency climbs or the API
+# times out or throttles (AIMD), so bulk jobs settle at the fastest rate the
+# API can take without tipping it over.
+#
+# Requires non-standard 'requests' python library to be installed.
+#
+# Version: 1.0
+# Date: 10/17/26
+# =============================================================================
+import time
+import threading
+import requests
+
+class AdaptiveLimiter:
+
+	# -------------------------------------------------------------------------
+	# Create a new AdaptiveLimiter object.
+	#
+	# initial - Starting limit on calls in flight
+	# minLimit - Lowest the limit is cut to
+	# maxLimit - Highest the limit grows to
+	# tolerance - Latency, as a multiple of the baseline, treated as overload
+	# backoff - Factor the limit is multiplied by on overload
+	# drift - Fraction per second the latency baseline may rise by
+	# statuses - HTTP status codes that mean the API is overloaded
+	def __init__(self, initial=8, minLimit=1, maxLimit=256, tolerance=2.0, backoff=0.75, drift=0.01, statuses=(429, 503)):
+		self.limit		= float(initial)
+		self.minLimit	= minLimit
+		self.maxLimit	= maxLimit
+		self.tolerance	= tolerance
+		self.backoff	= backoff
+		self.drift		= drift
+		self.statuses	= statuses
+		self.inFlight	= 0
+		self.baseline	= None
+		self.latency	= None
+		self.__slowStart = True
+		self.__cutAt	= 0
+		self.__updated	= time.time()
+		self.__cond		= threading.Condition()
+
+	# -------------------------------------------------------------------------
+	# Override string representation of AdaptiveLimiter object.
+	def __str__(self):
+		return '[%s: %d in flight, limit %.1f]' % (self.__class__.__name__, self.inFlight, self.limit)
+
+	# -------------------------------------------------------------------------
+	# Block until a call may start.
+	#
+	# timeout - Seconds to wait at most (None waits forever)
+	#
+	# Returns False if no slot freed up within timeout.
+	def acquire(self, timeout=None):
+		end = None if timeout is None else time.time() + timeout
+
+		with self.__cond:
+			while self.inFlight >= int(self.limit):
+				remaining = None if end is None else end - time.time()
+
+				if remaining is not None and remaining <= 0:
+					return False
+
+				self.__cond.wait(remaining)
+
+			self.inFlight += 1
+			return True
+
+	# -------------------------------------------------------------------------
+	# Finish a call without adjusting the limit, for calls whose outcome says
+	# nothing about the API (ex: the caller's Deadline ran out).
+	def cancel(self):
+		with self.__cond:
+			self.inFlight -= 1
+			self.__cond.notify()
+
+	# -------------------------------------------------------------------------
+	# Decide whether the outcome of a call means the API is overloaded.
+	def overloaded(self, response=None, error=None):
+		if error is not None:
+			return isinstance(error, (requests.Timeout, requests.ConnectionError))
+
+		return getattr(response, 'status_code', None) in self.statuses
+
+	# -------------------------------------------------------------------------
+	# Finish a call and adjust the limit.
+	#
+	# The baseline tracks the lowest latency seen, rising by at most drift per
+	# second in case the API gets slower for good, and the current latency is
+	# a fast moving average.  While the current latency stays within tolerance
+	# of the baseline the limit grows by one per call in slow start, and by about one
+	# per limit's worth of calls after that.  An overload cuts the limit at
+	# most once per current latency, so one burst of failures counts once.
+	#
+	# elapsed - Seconds the call took
+	# response - Response received (if any)
+	# error - Exception raised (if any)
+	def release(self, elapsed, response=None, error=None):
+		overloaded = self.overloaded(response, error)
+
+		with self.__cond:
+			self.inFlight -= 1
+
+			now = time.time()
+
+			if not overloaded:
+				self.latency	= elapsed if self.latency is None else self.latency * 0.7 + elapsed * 0.3
+				self.baseline	= elapsed if self.baseline is None else min(elapsed, self.baseline * (1 + self.drift * (now - self.__updated)))
+				self.__updated	= now
+				overloaded		= self.latency > self.tolerance * self.baseline
+
+			if overloaded:
+				if now - self.__cutAt >= (self.latency or 0):
+					self.limit			= max(self.minLimit, self.limit * self.backoff)
+					self.__cutAt		= now
+					self.__slowStart	= False
+			elif self.inFlight + 1 >= self.limit / 2:
+				self.limit = min(self.maxLimit, self.limit + (1 if self.__slowStart else 1 / self.limit))
+
+			self.__cond.notify(max(1, int(self.limit) - self.inFlight))
+
+# -----------------------------------------------------------------------------
+# Testing code
+if __name__ == '__main__':
+
+	from executor import Executor
+
+	# Test growth while latency holds steady, then cut back as it climbs
+	print '**** TEST: AdaptiveLimiter'
+	limiter = AdaptiveLimiter(initial=4)
+
+	def call(x):
+		limiter.acquire()
+		start = time.time()
+		time.sleep(0.01 * max(1, limiter.inFlight / 32.0))
+		limiter.release(time.time() - start)
+
+	executor = Executor(128)
+	executor.map(call, range(3000))
+	print limiter
+	executor.shutdown()
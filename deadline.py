@@ -0,0 +1,121 @@
+# =============================================================================
+# deadline.py
+#
+# Overall time budgets for multi-call operations.  Inside a 'with Deadline()'
+# block every WPM API call made on the thread gets only the time remaining.
+#
+# Requires non-standard 'requests' python library to be installed.
+#
+# Version: 1.0
+# Date: 10/17/26
+# =============================================================================
+import time
+import threading
+import requests
+
+# -----------------------------------------------------------------------------
+# Raised when a call can't complete before its deadline.
+class DeadlineExceeded(requests.Timeout):
+	pass
+
+class Deadline:
+
+	__local = threading.local()
+
+	# -------------------------------------------------------------------------
+	# Create a new Deadline object.
+	#
+	# seconds - Time budget from now
+	def __init__(self, seconds):
+		self.seconds	= seconds
+		self.expires	= time.time() + seconds
+
+	# -------------------------------------------------------------------------
+	# Override string representation of Deadline object.
+	def __str__(self):
+		return '[%s: %.3fs remaining]' % (self.__class__.__name__, self.remaining())
+
+	# -------------------------------------------------------------------------
+	# Make this the thread's deadline for the block.  A tighter enclosing
+	# deadline still wins.
+	def __enter__(self):
+		stack	= Deadline.__stack()
+		outer	= stack[-1] if stack else None
+		stack.append(outer if outer is not None and outer.expires < self.expires else self)
+		return self
+
+	def __exit__(self, *excInfo):
+		Deadline.__stack().pop()
+
+	# -------------------------------------------------------------------------
+	# Get the calling thread's stack of deadlines.
+	@classmethod
+	def __stack(cls):
+		if not hasattr(cls.__local, 'stack'):
+			cls.__local.stack = []
+
+		return cls.__local.stack
+
+	# -------------------------------------------------------------------------
+	# Get the deadline in effect on the calling thread (None if there isn't one).
+	@classmethod
+	def current(cls):
+		stack = cls.__stack()
+		return stack[-1] if stack else None
+
+	# -------------------------------------------------------------------------
+	# Run fn(*args) within a deadline, usually one carried over from the thread
+	# that handed the work off.  With no deadline fn(*args) runs as is.
+	#
+	# deadline - Deadline object (or None)
+	# fn - Function to run
+	@classmethod
+	def within(cls, deadline, fn, *args):
+		if deadline is None:
+			return fn(*args)
+
+		with deadline:
+			return fn(*args)
+
+	# -------------------------------------------------------------------------
+	# Get the seconds left before the deadline (never negative).
+	def remaining(self):
+		return max(0.0, self.expires - time.time())
+
+	def expired(self):
+		return time.time() >= self.expires
+
+	# -------------------------------------------------------------------------
+	# Raise DeadlineExceeded if the deadline has passed.
+	def check(self):
+		if self.expired():
+			raise DeadlineExceeded('Deadline of %s seconds exceeded' % self.seconds)
+
+# -----------------------------------------------------------------------------
+# Testing code
+if __name__ == '__main__':
+
+	# Test nesting
+	print '**** TEST: nesting'
+	with Deadline(1) as outer:
+		with Deadline(10):
+			print Deadline.current() is outer
+
+		with Deadline(0.5) as inner:
+			print Deadline.current() is inner
+
+	print Deadline.current()
+
+	# Test within
+	print '**** TEST: within'
+	print Deadline.within(None, Deadline.current), Deadline.within(Deadline(1), Deadline.current)
+
+	# Test check
+	print '**** TEST: check'
+	deadline = Deadline(0.01)
+	time.sleep(0.02)
+
+	try:
+		deadline.check()
+	except DeadlineExceeded as e:
+		print 'DeadlineExceeded:', e
@@ -0,0 +1,291 @@
+# =============================================================================
+# executor.py
+#
+# A small thread pool and Future to run WPM API calls concurrently.
+#
+# Version: 1.0
+# Date: 10/17/26
+# =============================================================================
+import sys
+import time
+import Queue
+import threading
+
+# -----------------------------------------------------------------------------
+# Raised by Future.result() when the result isn't ready in time.
+class FutureTimeout(Exception):
+	pass
+
+# -----------------------------------------------------------------------------
+# Raised by Future.result() when the Future was cancelled before it ran.
+class CancelledError(Exception):
+	pass
+
+class Future:
+
+	PENDING		= 'PENDING'
+	RUNNING		= 'RUNNING'
+	CANCELLED	= 'CANCELLED'
+	FINISHED	= 'FINISHED'
+
+	# -------------------------------------------------------------------------
+	# Create a new Future object.
+	def __init__(self):
+		self.state		= Future.PENDING
+		self.__value	= None
+		self.__excInfo	= None
+		self.__event	= threading.Event()
+		self.__lock		= threading.Lock()
+		self.__callbacks = []
+
+	# -------------------------------------------------------------------------
+	# Override string representation of Future object.
+	def __str__(self):
+		return '[%s: %s]' % (self.__class__.__name__, self.state)
+
+	# -------------------------------------------------------------------------
+	# Mark the Future as finished and run any registered callbacks.  The event
+	# is set under the lock addDoneCallback() checks it with, so a callback
+	# is either in the list taken here or sees the Future done.  A failing
+	# callback doesn't stop the others (or the worker thread running them).
+	def __finish(self, state):
+		with self.__lock:
+			self.state	= state
+			callbacks	= self.__callbacks
+			self.__callbacks = []
+			self.__event.set()
+
+		for callback in callbacks:
+			try:
+				callback(self)
+			except Exception:
+				pass
+
+	# -------------------------------------------------------------------------
+	# Move the Future to running.  Returns False if it was cancelled first.
+	def start(self):
+		with self.__lock:
+			if self.state != Future.PENDING:
+				return False
+			self.state = Future.RUNNING
+			return True
+
+	# -------------------------------------------------------------------------
+	# Cancel the Future if it hasn't started running yet.  The state changes
+	# under the same lock as start(), so a worker can't pick the call up once
+	# cancel() has returned True.
+	def cancel(self):
+		with self.__lock:
+			if self.state != Future.PENDING:
+				return self.state == Future.CANCELLED
+
+			self.state = Future.CANCELLED
+
+		self.__finish(Future.CANCELLED)
+		return True
+
+	def cancelled(self):
+		return self.state == Future.CANCELLED
+
+	def done(self):
+		return self.__event.isSet()
+
+	# -------------------------------------------------------------------------
+	# Setters for the outcome of the Future.
+	def setResult(self, value):
+		self.__value = value
+		self.__finish(Future.FINISHED)
+
+	def setException(self, excInfo):
+		self.__excInfo = excInfo
+		self.__finish(Future.FINISHED)
+
+	# -------------------------------------------------------------------------
+	# Register a callback to run (with the Future) once it is done.
+	def addDoneCallback(self, callback):
+		with self.__lock:
+			if not self.__event.isSet():
+				self.__callbacks.append(callback)
+				return
+
+		callback(self)
+
+	# -------------------------------------------------------------------------
+	# Wait for and return the exception raised by the call (or None).
+	#
+	# timeout - Seconds to wait (None waits forever)
+	def exception(self, timeout=None):
+		if not self.__event.wait(timeout):
+			raise FutureTimeout('Future not done after %s seconds' % timeout)
+
+		if self.state == Future.CANCELLED:
+			raise CancelledError()
+
+		return self.__excInfo[1] if self.__excInfo else None
+
+	# -------------------------------------------------------------------------
+	# Wait for and return the result of the call, re-raising its exception.
+	#
+	# timeout - Seconds to wait (None waits forever)
+	def result(self, timeout=None):
+		if self.exception(timeout) is not None:
+			raise self.__excInfo[0], self.__excInfo[1], self.__excInfo[2]
+
+		return self.__value
+
+class Executor:
+
+	# -------------------------------------------------------------------------
+	# Create a new Executor object.
+	#
+	# workers - Maximum number of worker threads (None is unlimited)
+	# name - Prefix for worker thread names
+	def __init__(self, workers=8, name='wpm'):
+		self.workers	= workers
+		self.name		= name
+		self.__queue	= Queue.Queue()
+		self.__threads	= []
+		self.__idle		= 0
+		self.__lock		= threading.Lock()
+		self.__shutdown	= False
+
+	# -------------------------------------------------------------------------
+	# Override string representation of Executor object.
+	def __str__(self):
+		return '[%s: %s, %s]' % (self.__class__.__name__, self.name, self.workers)
+
+	# -------------------------------------------------------------------------
+	# Start another worker thread if queued work outnumbers the idle workers
+	# and the pool isn't full yet.
+	def __grow(self):
+		with self.__lock:
+			if (self.workers is not None and len(self.__threads) >= self.workers) or self.__queue.qsize() <= self.__idle:
+				return
+
+			thread = threading.Thread(target=self.__work, name='%s-%d' % (self.name, len(self.__threads)))
+			thread.daemon = True
+			thread.start()
+			self.__threads.append(thread)
+
+	# -------------------------------------------------------------------------
+	# Worker loop: run queued calls until a shutdown sentinel is received.  A
+	# worker counts as idle again before it hands back a result, as that wakes
+	# callers who may submit more work straight away.
+	def __work(self):
+		with self.__lock:
+			self.__idle += 1
+
+		while True:
+			item = self.__queue.get()
+
+			with self.__lock:
+				self.__idle -= 1
+
+			if item is None:
+				return
+
+			future, fn, args, kwargs = item
+
+			if not future.start():
+				with self.__lock:
+					self.__idle += 1
+				continue
+
+			try:
+				value, excInfo = fn(*args, **kwargs), None
+			except BaseException:
+				value, excInfo = None, sys.exc_info()
+
+			with self.__lock:
+				self.__idle += 1
+
+			if excInfo is None:
+				future.setResult(value)
+			else:
+				future.setException(excInfo)
+
+	# -------------------------------------------------------------------------
+	# Schedule fn(*args, **kwargs) to run on a worker thread.
+	#
+	# Returns a Future for the result of the call.
+	def submit(self, fn, *args, **kwargs):
+		if self.__shutdown:
+			raise RuntimeError('Executor has been shut down')
+
+		future = Future()
+		self.__queue.put((future, fn, args, kwargs))
+		self.__grow()
+		return future
+
+	# -------------------------------------------------------------------------
+	# Run fn over every item and return the results in input order.
+	def map(self, fn, items):
+		return [future.result() for future in [self.submit(fn, item) for item in items]]
+
+	# -------------------------------------------------------------------------
+	# Stop accepting work and let the worker threads exit.
+	#
+	# wait - Block until queued work has finished
+	def shutdown(self, wait=True):
+		self.__shutdown = True
+
+		with self.__lock:
+			threads = list(self.__threads)
+
+		for thread in threads:
+			self.__queue.put(None)
+
+		if wait:
+			for thread in threads:
+				thread.join()
+
+# -----------------------------------------------------------------------------
+# Wait for a group of Futures.
+#
+# futures - List of Future objects
+# timeout - Seconds to wait for all of them (None waits forever)
+#
+# Returns a (done, notDone) tuple of lists.
+def wait(futures, timeout=None):
+	end = None if timeout is None else time.time() + timeout
+
+	for future in futures:
+		remaining = None if end is None else max(0, end - time.time())
+
+		if not future.done() and remaining is not None and remaining <= 0:
+			break
+
+		try:
+			future.exception(remaining)
+		except (FutureTimeout, CancelledError):
+			pass
+
+	done = [f for f in futures if f.done()]
+	return done, [f for f in futures if not f.done()]
+
+# -----------------------------------------------------------------------------
+# Testing code
+if __name__ == '__main__':
+
+	# Test submit
+	print '**** TEST: submit'
+	executor	= Executor(4)
+	future		= executor.submit(lambda x: x * 2, 21)
+	print future.result()
+
+	# Test exceptions
+	print '**** TEST: exception'
+	future		= executor.submit(lambda: 1 / 0)
+	print repr(future.exception())
+
+	# Test map
+	print '**** TEST: map'
+	print executor.map(lambda x: x * x, range(10))
+
+	# Test wait
+	print '**** TEST: wait'
+	futures		= [executor.submit(time.sleep, s) for s in (0, 0.1, 2)]
+	done, notDone = wait(futures, 0.5)
+	print len(done), len(notDone)
+
+	executor.shutdown()
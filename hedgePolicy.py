@@ -0,0 +1,242 @@
+# =============================================================================
+# hedgePolicy.py
+#
+# Hedged requests for idempotent reads.  When a call hasn't answered within a
+# percentile of the latency seen for its endpoint, an identical second call
+# is sent and whichever answers first wins.  A budget caps hedges at a
+# fraction of traffic so a slow API isn't hit with twice the load.
+#
+# Version: 1.0
+# Date: 10/17/26
+# =============================================================================
+import time
+import heapq
+import Queue
+import itertools
+import threading
+from collections import deque
+from executor import Executor
+from metrics import Metrics
+from deadline import Deadline
+
+class HedgePolicy:
+
+	# -------------------------------------------------------------------------
+	# Create a new HedgePolicy object.
+	#
+	# percentile - Percentile (0-100) of observed latency after which to hedge
+	# budget - Maximum fraction of calls that may be hedged
+	# minDelay - Never hedge sooner than this many seconds
+	# window - Number of most recent latencies kept per endpoint
+	# minSamples - Latencies needed for an endpoint before it is hedged
+	# workers - Maximum threads racing the calls (None is unlimited, so hedging never caps a client's concurrency)
+	# httpMethods - HTTP methods that are safe to hedge (idempotent)
+	def __init__(self, percentile=95, budget=0.05, minDelay=0.01, window=500, minSamples=20, workers=None, httpMethods=('GET',)):
+		self.percentile		= percentile
+		self.budget			= budget
+		self.minDelay		= minDelay
+		self.window			= window
+		self.minSamples		= minSamples
+		self.httpMethods	= httpMethods
+		self.executor		= Executor(workers, 'wpm-hedge')
+		self.calls			= 0
+		self.hedges			= 0
+		self.wins			= 0
+		self.__latencies	= {}
+		self.__delays		= {}
+		self.__tokens		= 0.0
+		self.__lock			= threading.Lock()
+		self.__timers		= []
+		self.__sequence		= itertools.count()
+		self.__wakeup		= threading.Condition()
+		self.__timer		= None
+
+	# -------------------------------------------------------------------------
+	# Override string representation of HedgePolicy object.
+	def __str__(self):
+		return '[%s: p%s, %s calls, %s hedges, %s wins]' % (self.__class__.__name__, self.percentile, self.calls, self.hedges, self.wins)
+
+	# -------------------------------------------------------------------------
+	# Get the endpoint a Request's latency is tracked under.
+	def __endpoint(self, request):
+		return (request.service, Metrics.idPattern.sub(':id', request.method))
+
+	# -------------------------------------------------------------------------
+	# Decide whether a Request may be hedged at all.
+	def applies(self, request):
+		return request.httpMethod in self.httpMethods
+
+	# -------------------------------------------------------------------------
+	# Add the latency of one attempt at a Request.  The hedge delay for the
+	# endpoint is recomputed every tenth of a window.
+	def observe(self, request, elapsed):
+		endpoint = self.__endpoint(request)
+
+		with self.__lock:
+			latencies = self.__latencies.get(endpoint)
+
+			if latencies is None:
+				latencies = self.__latencies[endpoint] = deque(maxlen=self.window)
+
+			latencies.append(elapsed)
+
+			if len(latencies) >= self.minSamples and (endpoint not in self.__delays or len(latencies) % max(1, self.window // 10) == 0):
+				ordered = sorted(latencies)
+				self.__delays[endpoint] = max(self.minDelay, ordered[min(len(ordered) - 1, int(self.percentile / 100.0 * len(ordered)))])
+
+	# -------------------------------------------------------------------------
+	# Get the seconds to wait before hedging a Request (None until enough
+	# latencies have been seen for its endpoint).
+	def delay(self, request):
+		return self.__delays.get(self.__endpoint(request))
+
+	# -------------------------------------------------------------------------
+	# Take a hedge from the budget.  Every call earns 'budget' of a hedge, so
+	# hedges can never run ahead of that fraction of traffic.
+	def __spend(self):
+		with self.__lock:
+			if self.__tokens < 1:
+				return False
+
+			self.__tokens	-= 1
+			self.hedges		+= 1
+			return True
+
+	# -------------------------------------------------------------------------
+	# Put None on a queue after some seconds.  One timer thread serves every
+	# race, as timed waits in Python 2 poll and would spin with each caller.
+	def __schedule(self, seconds, queue):
+		with self.__wakeup:
+			heapq.heappush(self.__timers, (time.time() + seconds, next(self.__sequence), queue))
+
+			if self.__timer is None:
+				self.__timer = threading.Thread(target=self.__tick, name='wpm-hedge-timer')
+				self.__timer.daemon = True
+				self.__timer.start()
+
+			self.__wakeup.notify()
+
+	def __tick(self):
+		with self.__wakeup:
+			while True:
+				now = time.time()
+
+				while self.__timers and self.__timers[0][0] <= now:
+					heapq.heappop(self.__timers)[2].put(None)
+
+				self.__wakeup.wait(self.__timers[0][0] - now if self.__timers else None)
+
+	# -------------------------------------------------------------------------
+	# Run one attempt on a worker thread within the caller's Deadline.
+	#
+	# started - Event set once the attempt is running (None for none)
+	def __run(self, request, attempt, args, deadline, started=None):
+		start = time.time()
+
+		if started is not None:
+			started.set()
+
+		results = Deadline.within(deadline, attempt, request, *args)
+
+		self.observe(request, time.time() - start)
+		return results
+
+	# -------------------------------------------------------------------------
+	# Throw away the response of the attempt that lost the race.  If it hasn't
+	# started it is cancelled, otherwise its connection goes back to the pool.
+	def __discard(self, future):
+		if future.cancel():
+			return
+
+		def close(future):
+			if future.exception() is None and hasattr(future.result(), 'close'):
+				future.result().close()
+
+		future.addDoneCallback(close)
+
+	# -------------------------------------------------------------------------
+	# Perform a Request, hedging it if the first attempt is slow.  The first
+	# attempt to return a response wins; an attempt that raises only wins if
+	# the other one raises too.
+	#
+	# request - Request object describing the call
+	# attempt - Function performing one attempt at the call (given request & args)
+	# args - Extra arguments for attempt
+	def race(self, request, attempt, *args):
+		delay = self.delay(request)
+
+		with self.__lock:
+			self.calls		+= 1
+			self.__tokens	= min(max(1.0, self.budget * self.window), self.__tokens + self.budget)
+
+		if delay is None:
+			start	= time.time()
+			results	= attempt(request, *args)
+			self.observe(request, time.time() - start)
+			return results
+
+		deadline	= Deadline.current()
+		done		= Queue.Queue()
+		started		= threading.Event()
+		futures		= [self.executor.submit(self.__run, request, attempt, args, deadline, started)]
+		futures[0].addDoneCallback(done.put)
+
+		# The hedge delay counts from when the first attempt is sent, not queued
+		started.wait()
+		self.__schedule(delay, done)
+		winner = done.get()
+
+		if winner is None:
+			if self.__spend():
+				futures.append(self.executor.submit(self.__run, request, attempt, args, deadline))
+				futures[1].addDoneCallback(done.put)
+
+			winner = done.get()
+
+		pending = len(futures)
+
+		while True:
+			pending -= 1
+
+			if winner.exception() is None or not pending:
+				break
+
+			winner = done.get()
+
+		for future in futures:
+			if future is not winner:
+				self.__discard(future)
+
+		results = winner.result()
+
+		if winner is not futures[0]:
+			with self.__lock:
+				self.wins += 1
+
+			results.hedged = True
+
+		return results
+
+# -----------------------------------------------------------------------------
+# Testing code
+if __name__ == '__main__':
+
+	import random
+	import requests
+	from client import Request
+
+	# Test hedging a slow tail
+	print '**** TEST: race'
+	hedge	= HedgePolicy(percentile=90, budget=0.2)
+	request	= Request('monitor', 'summary')
+
+	def attempt(request):
+		time.sleep(1.0 if random.random() < 0.1 else 0.01)
+		return requests.models.Response()
+
+	start = time.time()
+
+	for x in range(200):
+		hedge.race(request, attempt)
+
+	print hedge, '%.2fs' % (time.time() - start)
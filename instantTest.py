@@ -19,8 +19,9 @@ class InstantTest(Client):
 	#
 	# key - A WPM API Key for an account
 	# secret - A WPM API Secret for an account
-	def __init__(self, key, secret):
-		Client.__init__(self, key, secret, 'tools', '', 'GET')
+	# options - Optional Client settings (ex: transport)
+	def __init__(self, key, secret, **options):
+		Client.__init__(self, key, secret, 'tools', '', 'GET', **options)
 
 	# -------------------------------------------------------------------------
 	# Override string representation of Monitor object.
@@ -34,20 +35,14 @@ class InstantTest(Client):
 	#   * url: URL to test.
 	#   * callback: Callback URL to post results to.
 	def createInstantTestJob(self, params):
-		self.setService('tools/instanttest')
-		self.setMethod('')
-		self.setHttpMethod('POST')
-		return self.call(params)
+		return self.perform('tools/instanttest', '', 'POST', params)
 
 	# -------------------------------------------------------------------------
 	# API interaction to get results of an instant test job.
 	#
 	# testId - ID value of an instant test job. 
 	def getInstantTestJob(self, testId):
-		self.setService('tools/instanttest')
-		self.setMethod(testId)
-		self.setHttpMethod('GET')
-		return self.call()
+		return self.perform('tools/instanttest', testId, 'GET')
 
 	# -------------------------------------------------------------------------
 	# API interaction to get results of an instant test job by location.
@@ -55,10 +50,7 @@ class InstantTest(Client):
 	# testId - ID value of an instant test job.
 	# location - Location where test was run from.
 	def getInstantTestJobByLocation(self, testId, location):
-		self.setService('tools/instanttest')
-		self.setMethod(testId + '/' + locationId)
-		self.setHttpMethod('GET')
-		return self.call()
+		return self.perform('tools/instanttest', testId + '/' + location, 'GET')
 	
 # -----------------------------------------------------------------------------
 # Testing code
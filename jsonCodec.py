@@ -0,0 +1,72 @@
+# =============================================================================
+# jsonCodec.py
+#
+# Pluggable JSON encoding/decoding for WPM API payloads.  The fastest backend
+# installed is used (orjson, ujson, simplejson), falling back to the standard
+# library json module.
+#
+# Version: 1.0
+# Date: 10/17/26
+# =============================================================================
+import json
+
+backends	= {'json': (json.loads, json.dumps)}
+preference	= ['orjson', 'ujson', 'simplejson', 'json']
+
+try:
+	import orjson
+	backends['orjson'] = (orjson.loads, orjson.dumps)
+except ImportError:
+	pass
+
+try:
+	import ujson
+	backends['ujson'] = (ujson.loads, ujson.dumps)
+except ImportError:
+	pass
+
+try:
+	import simplejson
+	backends['simplejson'] = (simplejson.loads, simplejson.dumps)
+except ImportError:
+	pass
+
+backend		= ''
+loads		= None
+dumps		= None
+
+# -----------------------------------------------------------------------------
+# Select the backend used by loads() and dumps().
+#
+# name - Name of an installed backend (None picks the fastest installed)
+def setBackend(name=None):
+	global backend, loads, dumps
+
+	if name is None:
+		name = [n for n in preference if n in backends][0]
+
+	if name not in backends:
+		raise ValueError('JSON backend not installed: %s' % name)
+
+	backend			= name
+	loads, dumps	= backends[name]
+
+setBackend()
+
+# -----------------------------------------------------------------------------
+# Testing code
+if __name__ == '__main__':
+
+	# Test the selected backend
+	print '**** TEST: backend'
+	print backend, sorted(backends.keys())
+
+	# Test round trip through every backend
+	print '**** TEST: round trip'
+	document = {'data': {'items': [{'id': 'abc', 'duration': 1234.5, 'tags': [u'caf\xe9']}]}}
+
+	for name in sorted(backends.keys()):
+		setBackend(name)
+		print name, loads(dumps(document)) == document
+
+	setBackend()
@@ -0,0 +1,171 @@
+# =============================================================================
+# jsonStream.py
+#
+# Incremental decoding of large WPM API responses.  Elements of the items
+# array are decoded and yielded one at a time as the body arrives, so only
+# the element being decoded (plus one read chunk) is held in memory.
+#
+# Version: 1.0
+# Date: 10/17/26
+# =============================================================================
+import json
+
+WHITESPACE = ' \t\n\r'
+DELIMITERS = ',]}' + WHITESPACE
+
+# -----------------------------------------------------------------------------
+# A growing buffer over an iterator of byte chunks.
+class ChunkReader:
+
+	compactSize = 65536			# Drop consumed bytes once this many have built up
+
+	# -------------------------------------------------------------------------
+	# Create a new ChunkReader object.
+	#
+	# chunks - Iterator of byte strings (ex: response.iter_content())
+	def __init__(self, chunks):
+		self.chunks		= iter(chunks)
+		self.buffer		= ''
+		self.pos		= 0
+		self.eof		= False
+		self.decoder	= json.JSONDecoder()
+
+	# -------------------------------------------------------------------------
+	# Read another chunk into the buffer.  Returns False at the end of input.
+	def more(self):
+		if self.eof:
+			return False
+
+		if self.pos > ChunkReader.compactSize:
+			self.buffer	= self.buffer[self.pos:]
+			self.pos	= 0
+
+		for chunk in self.chunks:
+			if chunk:
+				self.buffer += chunk
+				return True
+
+		self.eof = True
+		return False
+
+	# -------------------------------------------------------------------------
+	# Skip whitespace and return the next character (None at the end of input).
+	def peek(self):
+		while True:
+			while self.pos < len(self.buffer) and self.buffer[self.pos] in WHITESPACE:
+				self.pos += 1
+
+			if self.pos < len(self.buffer):
+				return self.buffer[self.pos]
+
+			if not self.more():
+				return None
+
+	# -------------------------------------------------------------------------
+	# Consume the next character, which must be one of chars.
+	def expect(self, chars):
+		char = self.peek()
+
+		if char is None or char not in chars:
+			raise ValueError('Expected %r at byte %d, got %r' % (chars, self.pos, char))
+
+		self.pos += 1
+		return char
+
+	# -------------------------------------------------------------------------
+	# Decode the next complete JSON value, reading more input as needed.
+	def decode(self):
+		self.peek()
+
+		while True:
+			try:
+				value, end = self.decoder.raw_decode(self.buffer, self.pos)
+			except ValueError:
+				# Read until the undecoded input has doubled before trying again,
+				# so a large value is rescanned a few times, not once per chunk.
+				target = 2 * (len(self.buffer) - self.pos)
+
+				if not self.more():
+					raise
+
+				while len(self.buffer) - self.pos < target and self.more():
+					pass
+
+				continue
+
+			# A number (or literal) is only complete once a delimiter follows it, as
+			# the next chunk may continue it (ex: '1234.' + '5' or '1e' + '5').
+			if not isinstance(value, (dict, list, basestring)) and (end == len(self.buffer) or self.buffer[end] not in DELIMITERS) and self.more():
+				continue
+
+			self.pos = end
+			return value
+
+# -----------------------------------------------------------------------------
+# Yield the elements of the array found at path in a JSON document.  If the
+# value at path isn't an array it is yielded as a single element.
+#
+# chunks - Iterator of byte strings making up the document
+# path - Keys leading to the array (ex: ('data', 'items'))
+def iterItems(chunks, path=('data', 'items')):
+	reader = ChunkReader(chunks)
+
+	for key in path:
+		reader.expect('{')
+
+		while True:
+			if reader.expect('",}') == '}':
+				return
+
+			if reader.buffer[reader.pos - 1] == ',':
+				continue
+
+			reader.pos -= 1
+			name = reader.decode()
+			reader.expect(':')
+
+			if name == key:
+				break
+
+			reader.decode()
+
+	if reader.peek() != '[':
+		yield reader.decode()
+		return
+
+	reader.expect('[')
+
+	while True:
+		char = reader.peek()
+
+		if char == ']':
+			return
+		elif char == ',':
+			reader.pos += 1
+		elif char is None:
+			raise ValueError('Truncated JSON array')
+		else:
+			yield reader.decode()
+
+# -----------------------------------------------------------------------------
+# Testing code
+if __name__ == '__main__':
+
+	# Test iterItems over small chunks
+	print '**** TEST: iterItems'
+	document	= json.dumps({'meta': {'x': [1, 2]}, 'data': {'count': 3, 'items': [{'id': 1}, {'id': 22}, 333]}})
+	chunks		= [document[i:i + 3] for i in range(0, len(document), 3)]
+	print list(iterItems(chunks))
+
+	# Test numbers split across chunks
+	print '**** TEST: iterItems (split numbers)'
+	print list(iterItems(['[1234.', '5, 6', '7e', '-1, tr', 'ue]'], ()))
+	print list(iterItems(['1e', '5'], ()))
+
+	# Test missing path
+	print '**** TEST: iterItems (missing path)'
+	print list(iterItems([json.dumps({'data': {}})]))
+
+	# Test non-array value
+	print '**** TEST: iterItems (object)'
+	print list(iterItems([json.dumps({'data': {'items': {'log': {}}}})]))
@@ -30,8 +30,9 @@ class LoadTest(Client):
 	#
 	# key - A WPM API Key for an account
 	# secret - A WPM API Secret for an account
-	def __init__(self, key, secret):
-		Client.__init__(self, key, secret, 'load', '', 'GET')
+	# options - Optional Client settings (ex: transport)
+	def __init__(self, key, secret, **options):
+		Client.__init__(self, key, secret, 'load', '', 'GET', **options)
 
 	# -------------------------------------------------------------------------
 	# Override string representation of LoadTest object.
@@ -43,18 +44,12 @@ class LoadTest(Client):
 	# 
 	# message - A string to echo back (no spaces).
 	def echoMessage(self, message):
-		self.setService('load')
-		self.setMethod(self.wpmAPIVersion + '/echo/' + message)
-		self.setHttpMethod('GET')
-		return self.call()
+		return self.perform('load', self.wpmAPIVersion + '/echo/' + message, 'GET')
 
 	# -------------------------------------------------------------------------
 	# API interaction to find out the username associated with API key/secret.
 	def whoAmI(self):
-		self.setService('load')
-		self.setMethod('whoami')
-		self.setHttpMethod('GET')
-		return self.call()
+		return self.perform('load', 'whoami', 'GET')
 
 	# -------------------------------------------------------------------------
 	# API interaction to get a list of tests as JSON response.
@@ -63,10 +58,7 @@ class LoadTest(Client):
 	#  * limit: The max number of tests to return.
 	#  * callback: A javaScript function to send results to.
 	def getListOfTestsAsJSON(self, params):
-		self.setService('load')
-		self.setMethod('list/mostRecent')
-		self.setHttpMethod('GET')
-		return self.call(params)
+		return self.perform('load', 'list/mostRecent', 'GET', params)
 
 	# -------------------------------------------------------------------------
 	# API interaction to get a list of tests.
@@ -74,10 +66,7 @@ class LoadTest(Client):
 	# params - Dictionary list of parameters.
 	#  * limit: The number of tests to return.
 	def getListOfTests(self, limit):
-		self.setService('load')
-		self.setMethod('list')
-		self.setHttpMethod('GET')
-		return self.call()
+		return self.perform('load', 'list', 'GET')
 
 	# -------------------------------------------------------------------------
 	# API interaction to add tag to load test.
@@ -85,10 +74,7 @@ class LoadTest(Client):
 	# loadTestId - Id of the load test to tag.
 	# tagName - The tag to apply to the load test.
 	def addTag(self, loadTestId, tagName):
-		self.setService('load')
-		self.setMethod('/' + str(loadTestId) + '/tag/' + tagName)
-		self.setHttpMethod('PUT')
-		return self.call()
+		return self.perform('load', '/' + str(loadTestId) + '/tag/' + tagName, 'PUT')
 
 	# -------------------------------------------------------------------------
 	# API interaction to remove tag from load test.
@@ -96,50 +82,35 @@ class LoadTest(Client):
 	# loadTestId - The ID of the test to tag.
 	# tagName - The tag to remove from the load test.
 	def removeTag(self, loadTestId, tagName):
-		self.setService('load')
-		self.setMethod('/' + str(loadTestId) + '/tag/' + tagName)
-		self.setHttpMethod('DELETE')
-		return self.call()
+		return self.perform('load', '/' + str(loadTestId) + '/tag/' + tagName, 'DELETE')
 
 	# -------------------------------------------------------------------------
 	# API interaction to get a load test.
 	#
 	# loadTestId - The ID of the load test to get.
 	def getLoadTest(self, loadTestId):
-		self.setService('load')
-		self.setMethod('id/' + str(loadTestId))
-		self.setHttpMethod('GET')
-		return self.call()
+		return self.perform('load', 'id/' + str(loadTestId), 'GET')
 
 	# -------------------------------------------------------------------------
 	# API interaction to delete a load test.
 	# 
 	# loadTestId - The ID of the load test to delete.
 	def deleteLoadTest(self, loadTestId):
-		self.setService('load')
-		self.setMethod(str(loadTestId) + '/delete')
-		self.setHttpMethod('DELETE')
-		return self.call()
+		return self.perform('load', str(loadTestId) + '/delete', 'DELETE')
 
 	# -------------------------------------------------------------------------
 	# API interaction to pause a load test.
 	#
 	# loadTestId - The ID of the load test to pause.
 	def pauseLoadTest(self, loadTestId):
-		self.setService('load')
-		self.setMethod(str(loadTestId) + '/pause')
-		self.setHttpMethod('PUT')
-		return self.call()
+		return self.perform('load', str(loadTestId) + '/pause', 'PUT')
 
 	# -------------------------------------------------------------------------
 	# API interaction to resume a load test.
 	#
 	# loadTestId - The ID of the load test to resume.
 	def resumeLoadTest(self, loadTestId):
-		self.setService('load')
-		self.setMethod(str(loadTestId) + '/resume')
-		self.setHttpMethod('PUT')
-		return self.call()
+		return self.perform('load', str(loadTestId) + '/resume', 'PUT')
 
 	# -------------------------------------------------------------------------
 	# API interaction to schedule a load test.
@@ -152,10 +123,7 @@ class LoadTest(Client):
 	#  * overrideCode: An override code to use for the load test.
 	#  * parts: The test plan.
 	def scheduleLoadTest(self, params):
-		self.setService('load')
-		self.setMethod('schedule')
-		self.setHttpMethod('POST')
-		return self.call(params)
+		return self.perform('load', 'schedule', 'POST', params)
 
 # -----------------------------------------------------------------------------
 # Testing code
@@ -19,8 +19,9 @@ class MaintenanceWindow(Client):
 	#
 	# key - A WPM API Key for an account
 	# secret - A WPM API Secret for an account
-	def __init__(self, key, secret):
-		Client.__init__(self, key, secret, 'maintenance', '', 'GET')
+	# options - Optional Client settings (ex: transport)
+	def __init__(self, key, secret, **options):
+		Client.__init__(self, key, secret, 'maintenance', '', 'GET', **options)
 
 	# -------------------------------------------------------------------------
 	# Override string representation of MaintenanceWindow object.
@@ -39,28 +40,19 @@ class MaintenanceWindow(Client):
 	#   * monitor: Array of valid monitor IDs.
 	#   * duration: How long (in minutes) the maintenance window will last.
 	def createMaintenanceWindow(self, params):
-		self.setService('maintenance')
-		self.setMethod('')
-		self.setHttpMethod('POST')
-		return self.call(params)
+		return self.perform('maintenance', '', 'POST', params)
 
 	# -------------------------------------------------------------------------
 	# API interaction to list all maintenance windows for an account.
 	def listMaintenanceWindows(self):
-		self.setService('maintenance')
-		self.setMethod('')
-		self.setHttpMethod('GET')
-		return self.call()
+		return self.perform('maintenance', '', 'GET')
 
 	# -------------------------------------------------------------------------
 	# API interaction to get a specific maintenance window.
 	# 
 	# maintenanceId - The ID value of the maintenance window to retrieve.
 	def getMaintenanceWindow(self, maintenanceId):
-		self.setService('maintenance')
-		self.setMethod(maintenanceId)
-		self.setHttpMethod('GET')
-		return self.call()
+		return self.perform('maintenance', maintenanceId, 'GET')
 
 	# -------------------------------------------------------------------------
 	# API interaction to create a maintenance window.
@@ -75,18 +67,12 @@ class MaintenanceWindow(Client):
 	#   * monitor: Array of valid monitor IDs.
 	#   * duration: How long (in minutes) the maintenance window will last.
 	def updateMaintenanceWindow(self, maintenanceId, params):
-		self.setService('maintenance')
-		self.setMethod(maintenanceId)
-		self.setHttpMethod('PUT')
-		return self.call(params)
+		return self.perform('maintenance', maintenanceId, 'PUT', params)
 
 	# -------------------------------------------------------------------------
 	# API interaction to delete a maintenance window.
 	def deleteMaintenanceWindow(self, maintenanceId):
-		self.setService('maintenance')
-		self.setMethod(maintenanceId)
-		self.setHttpMethod('DELETE')
-		return self.call()
+		return self.perform('maintenance', maintenanceId, 'DELETE')
 	
 # -----------------------------------------------------------------------------
 # Testing code
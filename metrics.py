@@ -0,0 +1,233 @@
+# =============================================================================
+# metrics.py
+#
+# In-process latency, size and outcome metrics for WPM API calls, exportable
+# in Prometheus/OpenMetrics text format or through user supplied hooks.
+#
+# Version: 1.0
+# Date: 10/17/26
+# =============================================================================
+import re
+import bisect
+import threading
+
+# -----------------------------------------------------------------------------
+# A fixed bucket histogram.
+class Histogram:
+
+	# -------------------------------------------------------------------------
+	# Create a new Histogram object.
+	#
+	# buckets - Sorted upper bounds of the buckets
+	def __init__(self, buckets):
+		self.buckets	= buckets
+		self.counts		= [0] * (len(buckets) + 1)
+		self.sum		= 0
+		self.count		= 0
+
+	# -------------------------------------------------------------------------
+	# Add an observation.
+	def observe(self, value):
+		self.counts[bisect.bisect_left(self.buckets, value)] += 1
+		self.sum	+= value
+		self.count	+= 1
+
+	# -------------------------------------------------------------------------
+	# Estimate the value at quantile q (0-1) from the bucket bounds.
+	def quantile(self, q):
+		target	= q * self.count
+		seen	= 0
+
+		for i, count in enumerate(self.counts[:-1]):
+			seen += count
+			if count and seen >= target:
+				return self.buckets[i]
+
+		return self.buckets[-1] if self.count else 0
+
+class Metrics:
+
+	timeBuckets	= (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60)
+	sizeBuckets	= (256, 1024, 4096, 16384, 65536, 262144, 1048576, 4194304, 16777216)
+
+	# Method paths embed monitor, beacon, sample & test IDs.  These are folded
+	# into ':id' so the method label doesn't grow without bound.
+	idPattern	= re.compile(r'(?<=/)(?:[0-9a-fA-F]{16,}|\d+)(?=/|$)|^(?:[0-9a-fA-F]{16,}|\d+)(?=/|$)')
+
+	# -------------------------------------------------------------------------
+	# Create a new Metrics object.
+	#
+	# hook - Function called with a dictionary describing each finished call
+	# prefix - Prefix for exported metric names
+	def __init__(self, hook=None, prefix='wpm_client'):
+		self.hooks		= [hook] if hook else []
+		self.prefix		= prefix
+		self.counters	= {}
+		self.gauges		= {}
+		self.histograms	= {}
+		self.__lock		= threading.Lock()
+
+	# -------------------------------------------------------------------------
+	# Override string representation of Metrics object.
+	def __str__(self):
+		return '[%s: %s counters, %s histograms]' % (self.__class__.__name__, len(self.counters), len(self.histograms))
+
+	# -------------------------------------------------------------------------
+	# Register a function to be called with each finished call's record.
+	def addHook(self, hook):
+		self.hooks.append(hook)
+
+	# -------------------------------------------------------------------------
+	# Get the method label for an API method path.
+	def methodLabel(self, method):
+		return Metrics.idPattern.sub(':id', method) if method else ''
+
+	# -------------------------------------------------------------------------
+	# Primitive updates.  labels is a tuple of (name, value) pairs.
+	def count(self, name, labels, value=1):
+		with self.__lock:
+			key = (name, labels)
+			self.counters[key] = self.counters.get(key, 0) + value
+
+	def gauge(self, name, labels, value):
+		with self.__lock:
+			self.gauges[(name, labels)] = value
+
+	def observe(self, name, labels, value, buckets=None):
+		with self.__lock:
+			key = (name, labels)
+
+			if key not in self.histograms:
+				self.histograms[key] = Histogram(buckets or Metrics.timeBuckets)
+
+			self.histograms[key].observe(value)
+
+	# -------------------------------------------------------------------------
+	# Record a finished call.
+	#
+	# request - Request object describing the call
+	# elapsed - Seconds the call took
+	# response - Response received (if any)
+	# error - Exception raised (if any)
+	# cacheHit - True if the response came from the ResponseCache
+	def record(self, request, elapsed, response=None, error=None, cacheHit=False):
+		labels	= (('service', request.service), ('method', self.methodLabel(request.method)))
+		status	= getattr(response, 'status_code', 0)
+		ttfb	= response.elapsed.total_seconds() if hasattr(response, 'elapsed') and not cacheHit else None
+		retries	= getattr(response, 'retries', 0) if not cacheHit else 0
+		sent	= getattr(response, 'sentWire', 0) if not cacheHit else 0
+		received = getattr(response, 'receivedWire', 0) if not cacheHit else 0
+
+		self.count('requests_total', labels + (('status', str(status or error.__class__.__name__)),))
+		self.observe('request_seconds', labels, elapsed)
+
+		if ttfb is not None:
+			self.observe('ttfb_seconds', labels, ttfb)
+
+		if sent:
+			self.observe('request_bytes', labels, sent, Metrics.sizeBuckets)
+
+		if received:
+			self.observe('response_bytes', labels, received, Metrics.sizeBuckets)
+
+		if retries:
+			self.count('retries_total', labels, retries)
+
+		if cacheHit:
+			self.count('cache_hits_total', labels)
+
+		if getattr(response, 'hedged', False) and not cacheHit:
+			self.count('hedge_wins_total', labels)
+
+		for hook in self.hooks:
+			hook({
+				'service'	: request.service,
+				'method'	: request.method,
+				'httpMethod': request.httpMethod,
+				'status'	: status,
+				'error'		: error,
+				'total'		: elapsed,
+				'ttfb'		: ttfb,
+				'sent'		: sent,
+				'received'	: received,
+				'retries'	: retries,
+				'cacheHit'	: cacheHit,
+			})
+
+	# -------------------------------------------------------------------------
+	# Record the time spent decoding a response body.
+	def recordDecode(self, request, elapsed):
+		self.observe('decode_seconds', (('service', request.service), ('method', self.methodLabel(request.method))), elapsed)
+
+	# -------------------------------------------------------------------------
+	# Format a label set for the text exposition format.
+	def __labels(self, labels):
+		if not labels:
+			return ''
+
+		return '{%s}' % ','.join('%s="%s"' % (k, str(v).replace('\\', '\\\\').replace('"', '\\"')) for k, v in labels)
+
+	# -------------------------------------------------------------------------
+	# Export all metrics in Prometheus/OpenMetrics text format.
+	def exportPrometheus(self):
+		lines = []
+
+		with self.__lock:
+			counters	= sorted(self.counters.items())
+			gauges		= sorted(self.gauges.items())
+			histograms	= sorted((key, (h.buckets, list(h.counts), h.sum, h.count)) for key, h in self.histograms.items())
+
+		for kind, items in (('counter', counters), ('gauge', gauges)):
+			typed = set()
+
+			for (name, labels), value in items:
+				if name not in typed:
+					lines.append('# TYPE %s_%s %s' % (self.prefix, name, kind))
+					typed.add(name)
+
+				lines.append('%s_%s%s %s' % (self.prefix, name, self.__labels(labels), value))
+
+		typed = set()
+
+		for (name, labels), (buckets, counts, total, count) in histograms:
+			metric = '%s_%s' % (self.prefix, name)
+
+			if name not in typed:
+				lines.append('# TYPE %s histogram' % metric)
+				typed.add(name)
+
+			cumulative = 0
+
+			for bound, bucketCount in zip(list(buckets) + ['+Inf'], counts):
+				cumulative += bucketCount
+				lines.append('%s_bucket%s %s' % (metric, self.__labels(labels + (('le', bound),)), cumulative))
+
+			lines.append('%s_sum%s %s' % (metric, self.__labels(labels), total))
+			lines.append('%s_count%s %s' % (metric, self.__labels(labels), count))
+
+		return '\n'.join(lines) + '\n'
+
+# -----------------------------------------------------------------------------
+# Testing code
+if __name__ == '__main__':
+
+	import logging
+	from tester import Tester
+	from monitor import Monitor
+
+	# Variables for testing
+	key		= Tester.wpmAPIKey
+	secret	= Tester.wpmAPISecret
+
+	# Test methodLabel
+	print '**** TEST: methodLabel'
+	metrics = Metrics()
+	print metrics.methodLabel('383b86b85d2411e3a8d89848e167c3b7/sample/12345')
+
+	# Test recording calls
+	print '**** TEST: record'
+	logging.basicConfig(level=logging.DEBUG)
+	monitorClient = Monitor(key, secret, metrics=metrics)
+	monitorClient.getLocations()
+	monitorClient.callItems('listMonitors')
+	print metrics.exportPrometheus()
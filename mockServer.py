@@ -0,0 +1,332 @@
+# =============================================================================
+# mockServer.py
+#
+# A local stand-in for the WPM API, for testing and benchmarking the client
+# classes without touching the live platform.  Implements the 'monitor',
+# 'rum', 'load', 'script', 'tools/instanttest' and 'maintenance' endpoints
+# with configurable latency, payload sizes and error rates.
+#
+# Usage: python mockServer.py [--port 8080] [--latency 0.05] [--error-rate 0.01]
+#
+# Version: 1.0
+# Date: 10/17/26
+# =============================================================================
+import re
+import json
+import time
+import zlib
+import random
+import urlparse
+import argparse
+import threading
+import SocketServer
+import BaseHTTPServer
+from datetime import datetime, timedelta
+
+class MockHandler(BaseHTTPServer.BaseHTTPRequestHandler):
+
+	protocol_version	= 'HTTP/1.1'
+	server_version		= 'MockWPM/1.0'
+
+	# Write each response in one segment; header-by-header writes with Nagle
+	# on stall keep-alive clients on delayed ACKs.
+	wbufsize			= -1
+	disable_nagle_algorithm	= True
+
+	# -------------------------------------------------------------------------
+	# Silence per-request logging.
+	def log_message(self, format, *args):
+		pass
+
+	# -------------------------------------------------------------------------
+	# Handle every HTTP method the same way.
+	def do_GET(self):
+		self.server.answer(self)
+
+	do_POST = do_PUT = do_DELETE = do_GET
+
+class MockServer(SocketServer.ThreadingMixIn, BaseHTTPServer.HTTPServer):
+
+	daemon_threads		= True
+	allow_reuse_address	= True
+
+	services			= ('tools/instanttest', 'maintenance', 'monitor', 'script', 'load', 'rum')
+	locations			= ('washingtondc', 'sanjose', 'london', 'frankfurt', 'singapore', 'tokyo')
+
+	# -------------------------------------------------------------------------
+	# Create a new MockServer object.
+	#
+	# port - Port to listen on (0 picks a free port)
+	# latency - Seconds added to every response
+	# jitter - Maximum extra random seconds added to every response
+	# items - Number of items returned by list style calls
+	# itemSize - Bytes of padding added to each list item
+	# errorRate - Fraction of calls answered with a 503 (with Retry-After)
+	# monitors - Number of monitors in the fake account
+	# interval - Interval (minutes) of the fake monitors
+	# host - Address to bind
+	def __init__(self, port=0, latency=0.0, jitter=0.0, items=10, itemSize=0, errorRate=0.0, monitors=50, interval=1, host='127.0.0.1'):
+		BaseHTTPServer.HTTPServer.__init__(self, (host, port), MockHandler)
+		self.latency	= latency
+		self.jitter		= jitter
+		self.items		= items
+		self.itemSize	= itemSize
+		self.errorRate	= errorRate
+		self.interval	= interval
+		self.monitorIds	= ['%032x' % (0x383b86b85d2411e3a8d89848e167c3b7 + i) for i in range(monitors)]
+		self.calls		= 0
+		self.thread		= None
+		self.__lock		= threading.Lock()
+
+	# -------------------------------------------------------------------------
+	# Override string representation of MockServer object.
+	def __str__(self):
+		return '[%s: %s, %s calls]' % (self.__class__.__name__, self.base(), self.calls)
+
+	# -------------------------------------------------------------------------
+	# Get the API base URL to point Client.wpmAPIBase at.
+	def base(self):
+		return 'http://%s:%d/performance/' % self.server_address
+
+	# -------------------------------------------------------------------------
+	# Serve requests on a background thread.
+	def start(self):
+		self.thread			= threading.Thread(target=self.serve_forever, name='mock-wpm')
+		self.thread.daemon	= True
+		self.thread.start()
+		return self
+
+	# -------------------------------------------------------------------------
+	# Stop serving and close the listening socket.
+	def stop(self):
+		self.shutdown()
+		self.server_close()
+
+	# -------------------------------------------------------------------------
+	# Answer one request.
+	def answer(self, handler):
+		with self.__lock:
+			self.calls += 1
+
+		url		= urlparse.urlparse(handler.path)
+		params	= dict(urlparse.parse_qsl(url.query))
+		length	= int(handler.headers.get('Content-Length') or 0)
+		body	= handler.rfile.read(length) if length else ''
+
+		if handler.headers.get('Content-Encoding') in ('gzip', 'deflate'):
+			body = zlib.decompress(body, 47)
+
+		if self.latency or self.jitter:
+			time.sleep(self.latency + random.random() * self.jitter)
+
+		if not params.get('apikey') or not params.get('sig'):
+			return self.respond(handler, 401, {'errorCode': 'NOT_AUTHORIZED', 'errorMessage': 'Missing apikey or sig'})
+
+		if self.errorRate and random.random() < self.errorRate:
+			return self.respond(handler, 503, {'errorCode': 'UNAVAILABLE', 'errorMessage': 'Injected error'}, {'Retry-After': '1'})
+
+		path = url.path[len('/performance/'):] if url.path.startswith('/performance/') else url.path.lstrip('/')
+
+		for service in MockServer.services:
+			if path == service or path.startswith(service + '/'):
+				method = re.sub(r'^1\.0/?', '', path[len(service) + 1:])
+				data = body and json.loads(body) or {}
+				return self.respond(handler, 200, getattr(self, 'route' + service.split('/')[-1].capitalize())(handler.command, method, params, data))
+
+		self.respond(handler, 404, {'errorCode': 'NOT_FOUND', 'errorMessage': path})
+
+	# -------------------------------------------------------------------------
+	# Write a JSON response, gzip encoded if the client accepts it.
+	def respond(self, handler, status, payload, headers=None):
+		body = json.dumps(payload)
+
+		handler.send_response(status)
+		handler.send_header('Content-Type', 'application/json')
+
+		if 'gzip' in (handler.headers.get('Accept-Encoding') or ''):
+			gzip = zlib.compressobj(6, zlib.DEFLATED, 31)
+			body = gzip.compress(body) + gzip.flush()
+			handler.send_header('Content-Encoding', 'gzip')
+
+		for name, value in (headers or {}).items():
+			handler.send_header(name, value)
+
+		handler.send_header('Content-Length', str(len(body)))
+		handler.end_headers()
+		handler.wfile.write(body)
+
+	# =========================================================================
+	# Payload helpers.
+	def listOf(self, build, count=None):
+		return {'data': {'count': count or self.items, 'items': [build(i) for i in range(count or self.items)]}}
+
+	def padding(self):
+		return 'x' * self.itemSize
+
+	def created(self, **fields):
+		fields.setdefault('id', '%032x' % random.getrandbits(128))
+		return {'data': {'items': fields}}
+
+	def parseDate(self, value, default):
+		for fmt in ('%Y-%m-%dT%H:%M:%S', '%Y-%m-%d'):
+			try:
+				return datetime.strptime((value or '')[:19], fmt)
+			except ValueError:
+				pass
+
+		return default
+
+	# -------------------------------------------------------------------------
+	# Build the samples of a monitor between startDate and endDate, one per
+	# location per interval.  A date-only endDate covers the whole day.
+	def samples(self, monitorId, params):
+		now		= datetime.utcnow().replace(second=0, microsecond=0)
+		start	= self.parseDate(params.get('startDate'), now - timedelta(hours=1))
+		end		= self.parseDate(params.get('endDate'), now)
+
+		if len(params.get('endDate', '')) == 10:
+			end += timedelta(days=1)
+
+		step	= timedelta(minutes=self.interval)
+		epoch	= datetime(1970, 1, 1)
+		first	= int((start - epoch).total_seconds()) // (self.interval * 60) * self.interval * 60
+		when	= epoch + timedelta(seconds=first)
+		samples	= []
+
+		if when < start:
+			when += step
+
+		while when < end:
+			stamp = int((when - epoch).total_seconds())
+
+			for i, location in enumerate(MockServer.locations[:3]):
+				rand = random.Random(hash((monitorId, stamp, i)))
+				samples.append({
+					'id'		: '%s%08x%02d' % (monitorId[:8], stamp, i),
+					'monitorId'	: monitorId,
+					'startTime'	: when.strftime('%Y-%m-%dT%H:%M:%S'),
+					'location'	: location,
+					'duration'	: rand.randint(300, 4000),
+					'status'	: 'SUCCESS' if rand.random() > 0.03 else 'ERROR',
+					'bytes'		: rand.randint(50000, 900000),
+				})
+
+			when += step
+
+		return {'data': {'count': len(samples), 'items': samples}}
+
+	# -------------------------------------------------------------------------
+	# Build a raw sample in HAR format.
+	def har(self, sampleId):
+		rand	= random.Random(sampleId)
+		entries	= [{
+			'startedDateTime'	: '2026-10-17T12:00:00.%03dZ' % i,
+			'time'				: rand.randint(5, 900),
+			'request'			: {'method': 'GET', 'url': 'http://www.example.com/asset/%d' % i, 'headers': []},
+			'response'			: {'status': 200, 'bodySize': rand.randint(100, 90000), 'headers': [], 'content': {'size': rand.randint(100, 90000), 'text': self.padding()}},
+			'timings'			: {'dns': rand.randint(0, 40), 'connect': rand.randint(0, 90), 'wait': rand.randint(10, 400), 'receive': rand.randint(1, 200)},
+		} for i in range(self.items)]
+
+		return {'data': {'items': {'log': {'version': '1.2', 'entries': entries}}}}
+
+	# =========================================================================
+	# Endpoints.  Each takes (httpMethod, method, params, body) and returns
+	# the payload to send back.
+	def routeMonitor(self, httpMethod, method, params, body):
+		parts = method.split('/') if method else []
+
+		if httpMethod == 'POST':
+			return self.created(**body)
+		if httpMethod in ('PUT', 'DELETE'):
+			return self.created(id=parts[0])
+		if method == 'locations':
+			return {'data': {'items': [{'name': name, 'label': name.title()} for name in MockServer.locations]}}
+		if not parts:
+			return {'data': {'items': [{'id': id, 'name': 'Monitor %d' % i, 'interval': self.interval, 'active': 'true', 'locations': ','.join(MockServer.locations[:3])} for i, id in enumerate(self.monitorIds)]}}
+		if len(parts) == 1:
+			return {'data': {'items': [{'id': parts[0], 'name': 'Monitor', 'interval': self.interval, 'description': self.padding()}]}}
+		if parts[1] == 'summary':
+			return {'data': {'items': [{'monitorId': parts[0], 'location': location, 'status': 'SUCCESS', 'duration': random.randint(300, 4000)} for location in MockServer.locations[:3]]}}
+		if parts[1] == 'aggregate':
+			return self.listOf(lambda i: {'startDate': params.get('startDate'), 'frequency': params.get('frequency'), 'avgDuration': random.randint(300, 4000), 'count': 60})
+		if parts[1] == 'sample' and len(parts) > 2:
+			return self.har(parts[2])
+
+		return self.samples(parts[0], params)
+
+	def routeRum(self, httpMethod, method, params, body):
+		if httpMethod == 'POST':
+			return {'data': {'items': {'beaconId': '%032x' % random.getrandbits(128)}}}
+		if httpMethod in ('PUT', 'DELETE'):
+			return self.created(id=method.split('/')[-1])
+		if method == 'beacon':
+			return self.listOf(lambda i: {'beaconId': '%032x' % i, 'preferences': {'beaconName': 'Beacon %d' % i}})
+		if method == 'data/raw':
+			count = int(params.get('limit') or self.items)
+			return self.listOf(lambda i: {'url': 'http://www.example.com/page/%d' % i, 'pageLoadTime': random.randint(200, 20000), 'browser': 'Chrome', 'country': 'US', 'extra': self.padding()}, count)
+
+		return self.listOf(lambda i: {'beaconId': params.get('beaconId', ''), 'beaconName': 'Beacon %d' % i, 'value': random.random(), 'extra': self.padding()})
+
+	def routeLoad(self, httpMethod, method, params, body):
+		if method == 'whoami':
+			return {'data': {'username': 'mockuser', 'accountId': 1}}
+		if method.startswith('1.0/echo/'):
+			return {'data': {'message': method[len('1.0/echo/'):]}}
+		if method == 'schedule':
+			return {'data': {'loadTest': {'id': random.randint(1, 99999), 'name': body.get('name'), 'state': 'SCHEDULED'}}}
+		if method.startswith('id/'):
+			return {'data': {'loadTest': {'id': int(method[3:]), 'state': 'SCHEDULED'}}}
+		if method.startswith('list'):
+			return self.listOf(lambda i: {'id': i, 'name': 'Load Test %d' % i, 'state': 'COMPLETED'})
+
+		return {'data': {'loadTest': {'id': method.strip('/').split('/')[0], 'state': 'PAUSED' if method.endswith('pause') else 'SCHEDULED'}}}
+
+	def routeScript(self, httpMethod, method, params, body):
+		if httpMethod == 'POST':
+			return {'data': {'script': dict(body, id='%032x' % random.getrandbits(128))}}
+		if httpMethod == 'DELETE':
+			return {}
+		if httpMethod == 'PUT' or method:
+			return {'data': {'script': {'id': method, 'name': 'Script', 'scriptBody': self.padding()}}}
+
+		return self.listOf(lambda i: {'id': '%032x' % i, 'name': 'Script %d' % i})
+
+	def routeInstanttest(self, httpMethod, method, params, body):
+		if httpMethod == 'POST':
+			return self.created(url=body.get('url'), locations=[{'location': location, 'id': '%032x' % random.getrandbits(128)} for location in MockServer.locations])
+		if '/' in method:
+			return {'data': [{'status': 'COMPLETED', 'location': method.split('/')[1]}]}
+
+		return {'data': {'items': [{'location': location, 'status': 'COMPLETED'} for location in MockServer.locations]}}
+
+	def routeMaintenance(self, httpMethod, method, params, body):
+		if httpMethod == 'POST':
+			return self.created(**body)
+		if httpMethod in ('PUT', 'DELETE') or method:
+			return self.created(id=method)
+
+		return self.listOf(lambda i: {'id': '%032x' % i, 'name': 'Window %d' % i, 'monitor': ','.join(self.monitorIds[:3])})
+
+# -----------------------------------------------------------------------------
+# Run a standalone mock server.
+if __name__ == '__main__':
+
+	parser = argparse.ArgumentParser(description='Local stand-in for the WPM API.')
+	parser.add_argument('--host', default='127.0.0.1')
+	parser.add_argument('--port', type=int, default=8080)
+	parser.add_argument('--latency', type=float, default=0.0, help='seconds added to every response')
+	parser.add_argument('--jitter', type=float, default=0.0, help='maximum extra random seconds per response')
+	parser.add_argument('--items', type=int, default=10, help='items returned by list calls')
+	parser.add_argument('--item-size', type=int, default=0, help='bytes of padding per item')
+	parser.add_argument('--error-rate', type=float, default=0.0, help='fraction of calls answered with a 503')
+	parser.add_argument('--monitors', type=int, default=50)
+	parser.add_argument('--interval', type=int, default=1, help='monitor interval in minutes')
+	args = parser.parse_args()
+
+	server = MockServer(args.port, args.latency, args.jitter, args.items, args.item_size, args.error_rate, args.monitors, args.interval, args.host)
+	print 'Serving', server.base()
+
+	try:
+		server.serve_forever()
+	except KeyboardInterrupt:
+		server.server_close()
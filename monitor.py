@@ -9,17 +9,26 @@
 # Date: 02/15/13
 # Author: Tyler Fullerton
 # =============================================================================
-from client import Client
+import jsonCodec
+from datetime import datetime, timedelta
+from collections import deque
+from client import Client, Request
+from executor import Executor
+from deadline import Deadline
 
 class Monitor(Client):
 
+	# Keys leading to the HAR entries of a raw sample
+	rawEntriesPath = ('data', 'items', 'log', 'entries')
+
 	# -------------------------------------------------------------------------
 	# Create a new Monitor object.
 	#
 	# key - A WPM API Key for an account
 	# secret - A WPM API Secret for an account
-	def __init__(self, key, secret):
-		Client.__init__(self, key, secret, 'monitor', '', 'GET')
+	# options - Optional Client settings (ex: transport)
+	def __init__(self, key, secret, **options):
+		Client.__init__(self, key, secret, 'monitor', '', 'GET', **options)
 
 	# -------------------------------------------------------------------------
 	# Override string representation of Monitor object.
@@ -31,28 +40,19 @@ class Monitor(Client):
 	#
 	# params - Dictionary containing the details of the monitor to create.
 	def createMonitor(self, params):
-		self.setService('monitor')
-		self.setMethod('')
-		self.setHttpMethod('POST')
-		return self.call(params)
+		return self.perform('monitor', '', 'POST', params)
 
 	# -------------------------------------------------------------------------
 	# API interaction to list monitors on the WPM platform.
 	def listMonitors(self):
-		self.setService('monitor')
-		self.setMethod('')
-		self.setHttpMethod('GET')
-		return self.call()
+		return self.perform('monitor', '', 'GET')
 
 	# -------------------------------------------------------------------------
 	# API interaction to get a monitor from the WPM platform.
 	#
 	# monitorId - ID of the monitor to get.
 	def getMonitor(self, monitorId):
-		self.setService('monitor')
-		self.setMethod(monitorId)
-		self.setHttpMethod('GET')
-		return self.call()
+		return self.perform('monitor', monitorId, 'GET')
 
 	# -------------------------------------------------------------------------
 	# API interaction to update a monitor on the WPM platform.
@@ -60,20 +60,14 @@ class Monitor(Client):
 	# monitorId - ID of the monitor to delete.
 	# params - Dictionary containing the update details for the monitor.
 	def updateMonitor(self, monitorId, params):
-		self.setService('monitor')
-		self.setMethod(monitorId)
-		self.setHttpMethod('PUT')
-		return self.call(params)
+		return self.perform('monitor', monitorId, 'PUT', params)
 
 	# -------------------------------------------------------------------------
 	# API interaction to delete a monitor on the WPM platform.
 	#
 	# monitorId - ID of the monitor to delete.
 	def deleteMonitor(self, monitorId):
-		self.setService('monitor')
-		self.setMethod(monitorId)
-		self.setHttpMethod('DELETE')
-		return self.call()
+		return self.perform('monitor', monitorId, 'DELETE')
 
 	# -------------------------------------------------------------------------
 	# API interaction to get monitoring samples for a monitor.
@@ -81,10 +75,89 @@ class Monitor(Client):
 	# monitorId - ID of the monitoring service.
 	# params - Dictionary that provides startDate and endDate values.
 	def getMonitorSamples(self, monitorId, params):
-		self.setService('monitor')
-		self.setMethod(monitorId + '/sample')
-		self.setHttpMethod('GET')
-		return self.call(params)
+		return self.perform('monitor', monitorId + '/sample', 'GET', params)
+
+	# -------------------------------------------------------------------------
+	# API interaction to iterate over monitoring samples for a long date range.
+	# The range is split into windows sized by the monitor's interval, which
+	# are fetched concurrently (at most prefetch ahead of the caller) and
+	# yielded in time order.
+	#
+	# monitorId - ID of the monitoring service.
+	# params - Dictionary that provides startDate and endDate values.
+	# samplesPerWindow - Rough number of samples to fetch per call.
+	# prefetch - Number of windows fetched ahead of the one being yielded (at least 1).
+	# monitor - The monitor's details (interval & locations), if already known.
+	def iterMonitorSamples(self, monitorId, params, samplesPerWindow=2000, prefetch=4, monitor=None):
+		if prefetch < 1:
+			raise ValueError('prefetch must be at least 1, got %s' % prefetch)
+
+		if monitor is None:
+			monitor = self.callItems('getMonitor', monitorId)[0]
+
+		locations	= max(1, len([l for l in (monitor.get('locations') or '').split(',') if l]))
+		interval	= float(monitor.get('interval') or 1)
+		windows		= deque(self.__windows(params, timedelta(minutes=max(interval, interval * samplesPerWindow / locations))))
+		deadline	= Deadline.current()
+		executor	= Executor(prefetch, 'wpm-samples')
+		pending		= deque()
+
+		try:
+			for x in range(prefetch):
+				if windows:
+					pending.append(executor.submit(self.__sampleWindow, monitorId, params, windows.popleft(), deadline))
+
+			while pending:
+				items = pending.popleft().result()
+
+				if windows:
+					pending.append(executor.submit(self.__sampleWindow, monitorId, params, windows.popleft(), deadline))
+
+				for item in items:
+					yield item
+		finally:
+			for future in pending:
+				future.cancel()
+
+			executor.shutdown(False)
+
+	# -------------------------------------------------------------------------
+	# Split the startDate/endDate of params into (start, end, last) windows.
+	# A date-only endDate covers the whole day.
+	def __windows(self, params, size):
+		start	= self.__parseDate(params['startDate'])
+		end		= self.__parseDate(params['endDate'])
+		windows	= []
+
+		if len(params['endDate']) <= 10:
+			end += timedelta(days=1)
+
+		while start < end:
+			windows.append((start.strftime('%Y-%m-%dT%H:%M:%S'), min(start + size, end).strftime('%Y-%m-%dT%H:%M:%S'), start + size >= end))
+			start += size
+
+		return windows
+
+	def __parseDate(self, value):
+		return datetime.strptime(value[:19], '%Y-%m-%dT%H:%M:%S' if len(value) > 10 else '%Y-%m-%d')
+
+	# -------------------------------------------------------------------------
+	# Fetch the samples of one window, sorted by start time.  Samples on the
+	# boundary with the next window are left for that window.
+	def __sampleWindow(self, monitorId, params, window, deadline):
+		start, end, last	= window
+		windowParams		= dict(params, startDate=start, endDate=end)
+
+		response = Deadline.within(deadline, self.send, Request('monitor', monitorId + '/sample', 'GET', windowParams))
+
+		response.raise_for_status()
+		items = jsonCodec.loads(response.content).get('data', {}).get('items') or []
+
+		if not last:
+			items = [item for item in items if item.get('startTime', '')[:19] < end]
+
+		items.sort(key=lambda item: item.get('startTime', ''))
+		return items
 
 	# -------------------------------------------------------------------------
 	# API interaction to get raw monitoring data for a sample.
@@ -92,10 +165,27 @@ class Monitor(Client):
 	# monitorId - ID of the monitoring service.
 	# sampleId - ID of the particular sample to get raw data for.
 	def getRawMonitorSample(self, monitorId, sampleId):
-		self.setService('monitor')
-		self.setMethod(monitorId + '/sample/' + sampleId)
-		self.setHttpMethod('GET')
-		return self.call()
+		return self.perform('monitor', monitorId + '/sample/' + sampleId, 'GET')
+
+	# -------------------------------------------------------------------------
+	# API interaction to stream raw monitoring data for a sample.  The sample
+	# is a single HAR object, so its entries are yielded one at a time as the
+	# response arrives.
+	#
+	# monitorId - ID of the monitoring service.
+	# sampleId - ID of the particular sample to get raw data for.
+	def iterRawMonitorSample(self, monitorId, sampleId):
+		return self.iterItems(Request('monitor', monitorId + '/sample/' + sampleId, 'GET'), path=Monitor.rawEntriesPath)
+
+	# -------------------------------------------------------------------------
+	# API interaction to download raw monitoring data for a sample into a
+	# file-like object, without holding it in memory.
+	#
+	# monitorId - ID of the monitoring service.
+	# sampleId - ID of the particular sample to get raw data for.
+	# fileobj - Object with a write() method receiving the raw data.
+	def downloadRawMonitorSample(self, monitorId, sampleId, fileobj):
+		return self.download(Request('monitor', monitorId + '/sample/' + sampleId, 'GET'), fileobj)
 
 	# -------------------------------------------------------------------------
 	# API interaction to get aggregate monitoring data for a monitor.
@@ -103,28 +193,19 @@ class Monitor(Client):
 	# monitorId - ID of the monitoring service.
 	# params - Dictionary that provides startDate, endDate & frequency values.
 	def getAggregateMonitorData(self, monitorId, params):
-		self.setService('monitor')
-		self.setMethod(monitorId + '/aggregate')
-		self.setHttpMethod('GET')
-		return self.call(params)
+		return self.perform('monitor', monitorId + '/aggregate', 'GET', params)
 
 	# -------------------------------------------------------------------------
 	# API interaction to get a monitoring summary for a monitor.
 	#
 	# monitorId - ID of the monitoring service.
 	def getMonitorSummary(self, monitorId):
-		self.setService('monitor')
-		self.setMethod(monitorId + '/summary')
-		self.setHttpMethod('GET')
-		return self.call()
+		return self.perform('monitor', monitorId + '/summary', 'GET')
 
 	# -------------------------------------------------------------------------
 	# API interaction to list monitoring locations on the WPM platform.	
 	def getLocations(self):
-		self.setService('monitor')
-		self.setMethod('locations')
-		self.setHttpMethod('GET')
-		return self.call()
+		return self.perform('monitor', 'locations', 'GET')
 	
 # -----------------------------------------------------------------------------
 # Testing code
@@ -208,11 +289,21 @@ if __name__ == '__main__':
 	sampleId	= jsonObj.get('data', {}).get('items', [])[0].get('id', '')
 	print 'Got a sample ID:', sampleId
 
+	# Test iterMonitorSamples
+	print '**** TEST: iterMonitorSamples'
+	for sample in monitorClient.iterMonitorSamples(testService, dateParams):
+		print sample.get('startTime'), sample.get('location'), sample.get('duration')
+
 	# Test getRawMonitorSample
 	print '**** TEST: getRawMonitorSample'
 	response	= monitorClient.getRawMonitorSample(testService, sampleId)
 	print response.text
 
+	# Test iterRawMonitorSample
+	print '**** TEST: iterRawMonitorSample'
+	for item in monitorClient.iterRawMonitorSample(testService, sampleId):
+		print item
+
 	# Test getAggregateMonitorData
 	print '**** TEST: getAggregateMonitorData'
 	dateParams['frequency'] = 'hour'
@@ -0,0 +1,146 @@
+# =============================================================================
+# priorityScheduler.py
+#
+# Priority lanes for WPM API calls sharing a connection pool and rate limit.
+# Waiting calls are admitted in weighted fair queueing order, so a backfill
+# saturating the quota only gets its share and interactive calls go first.
+#
+# Version: 1.0
+# Date: 10/17/26
+# =============================================================================
+import heapq
+import itertools
+import threading
+
+class PriorityScheduler:
+
+	INTERACTIVE	= 'interactive'
+	NORMAL		= 'normal'
+	BULK		= 'bulk'
+
+	# -------------------------------------------------------------------------
+	# Create a new PriorityScheduler object.
+	#
+	# slots - Maximum calls in flight (match the transport's pool size)
+	# weights - Share of admissions per priority lane
+	def __init__(self, slots=10, weights=None):
+		self.slots		= slots
+		self.weights	= weights or {PriorityScheduler.INTERACTIVE: 16, PriorityScheduler.NORMAL: 4, PriorityScheduler.BULK: 1}
+		self.inFlight	= 0
+		self.admitted	= dict((lane, 0) for lane in self.weights)
+		self.__waiting	= []
+		self.__finish	= dict((lane, 0.0) for lane in self.weights)
+		self.__clock	= 0.0
+		self.__admitting = False
+		self.__order	= itertools.count()
+		self.__lock		= threading.Lock()
+
+	# -------------------------------------------------------------------------
+	# Override string representation of PriorityScheduler object.
+	def __str__(self):
+		return '[%s: %s/%s in flight, %s waiting, %s]' % (self.__class__.__name__, self.inFlight, self.slots, len(self.__waiting), ', '.join('%s=%s' % item for item in sorted(self.admitted.items())))
+
+	# -------------------------------------------------------------------------
+	# Admit the next waiting call if a slot is free and no other call is being
+	# admitted.  Must be called holding the lock.
+	def __dispatch(self):
+		while self.__waiting and not self.__admitting and self.inFlight < self.slots:
+			tag, order, waiter = heapq.heappop(self.__waiting)
+
+			if waiter[1]:
+				continue
+
+			self.__clock		= tag
+			self.__admitting	= True
+			self.inFlight		+= 1
+			waiter[0].set()
+
+	# -------------------------------------------------------------------------
+	# Block until a call is admitted.  Calls are admitted one at a time, in
+	# order of their lane's virtual finish time, so only the call whose turn
+	# it is waits on admit (ex: the rate limiter).
+	#
+	# priority - Lane of the call (see weights)
+	# timeout - Seconds to wait at most (None waits forever)
+	# admit - Function run once it's the call's turn, before the next call's turn
+	#
+	# Returns False if the call wasn't admitted within timeout.
+	def acquire(self, priority=NORMAL, timeout=None, admit=None):
+		if priority not in self.weights:
+			raise ValueError('Invalid priority: %s' % priority)
+
+		waiter = [threading.Event(), False]
+
+		with self.__lock:
+			tag						= max(self.__clock, self.__finish[priority]) + 1.0 / self.weights[priority]
+			self.__finish[priority]	= tag
+			heapq.heappush(self.__waiting, (tag, next(self.__order), waiter))
+			self.__dispatch()
+
+		if not waiter[0].wait(timeout):
+			with self.__lock:
+				if not waiter[0].isSet():
+					waiter[1] = True
+					return False
+
+		try:
+			if admit is not None:
+				admit()
+		except BaseException:
+			self.release(True)
+			raise
+
+		with self.__lock:
+			self.admitted[priority]	+= 1
+			self.__admitting		= False
+			self.__dispatch()
+
+		return True
+
+	# -------------------------------------------------------------------------
+	# Free the slot of a finished call.
+	#
+	# admitting - True if the call failed while being admitted
+	def release(self, admitting=False):
+		with self.__lock:
+			self.inFlight -= 1
+
+			if admitting:
+				self.__admitting = False
+
+			self.__dispatch()
+
+# -----------------------------------------------------------------------------
+# Testing code
+if __name__ == '__main__':
+
+	import time
+	from executor import Executor
+	from rateLimiter import TokenBucket
+
+	# Test interactive calls cutting in front of a bulk backlog on a shared quota
+	print '**** TEST: PriorityScheduler'
+	scheduler	= PriorityScheduler(slots=4)
+	bucket		= TokenBucket(50, 1)
+	waits		= {}
+
+	def call(priority):
+		start = time.time()
+		scheduler.acquire(priority, admit=bucket.acquire)
+		waits.setdefault(priority, []).append(time.time() - start)
+		time.sleep(0.02)
+		scheduler.release()
+
+	executor	= Executor(64)
+	futures		= [executor.submit(call, PriorityScheduler.BULK) for x in range(100)]
+	time.sleep(0.2)
+	futures		+= [executor.submit(call, PriorityScheduler.INTERACTIVE) for x in range(10)]
+
+	for future in futures:
+		future.result()
+
+	for priority, seconds in sorted(waits.items()):
+		print '%-12s mean wait %.3fs' % (priority, sum(seconds) / len(seconds))
+
+	print scheduler
+	executor.shutdown()
@@ -0,0 +1,118 @@
+# =============================================================================
+# rateLimiter.py
+#
+# Client side token bucket rate limiting for WPM API calls.
+#
+# Version: 1.0
+# Date: 10/17/26
+# =============================================================================
+import time
+import threading
+
+class TokenBucket:
+
+	# -------------------------------------------------------------------------
+	# Create a new TokenBucket object.
+	#
+	# rate - Tokens added per second
+	# burst - Maximum tokens the bucket holds (defaults to rate)
+	def __init__(self, rate, burst=None):
+		self.rate		= float(rate)
+		self.burst		= float(burst or max(rate, 1))
+		self.__tokens	= self.burst
+		self.__updated	= time.time()
+		self.__lock		= threading.Lock()
+
+	# -------------------------------------------------------------------------
+	# Override string representation of TokenBucket object.
+	def __str__(self):
+		return '[%s: %s/s, %s]' % (self.__class__.__name__, self.rate, self.burst)
+
+	# -------------------------------------------------------------------------
+	# Take tokens, or return how many seconds to wait until they're available.
+	def __take(self, tokens):
+		with self.__lock:
+			now				= time.time()
+			self.__tokens	= min(self.burst, self.__tokens + (now - self.__updated) * self.rate)
+			self.__updated	= now
+
+			if self.__tokens >= tokens:
+				self.__tokens -= tokens
+				return 0
+
+			return (tokens - self.__tokens) / self.rate
+
+	# -------------------------------------------------------------------------
+	# Block until tokens are available and take them.
+	#
+	# tokens - Number of tokens to take
+	# timeout - Seconds to wait at most (None waits forever)
+	#
+	# Returns False if the tokens couldn't be taken within timeout.
+	def acquire(self, tokens=1, timeout=None):
+		end = None if timeout is None else time.time() + timeout
+
+		while True:
+			wait = self.__take(tokens)
+
+			if not wait:
+				return True
+
+			if end is not None and time.time() + wait > end:
+				return False
+
+			time.sleep(wait)
+
+class RateLimiter:
+
+	# -------------------------------------------------------------------------
+	# Create a new RateLimiter object.
+	#
+	# rate - Calls per second allowed for services without their own limit (None is unlimited)
+	# burst - Calls allowed in a burst for those services
+	# services - Dictionary of per service limits, service: rate or (rate, burst)
+	#            (ex: {'rum': (5, 10), 'monitor': 20})
+	def __init__(self, rate=None, burst=None, services=None):
+		self.default	= TokenBucket(rate, burst) if rate else None
+		self.buckets	= {}
+
+		for service, limit in (services or {}).items():
+			self.buckets[service] = TokenBucket(*limit) if isinstance(limit, tuple) else TokenBucket(limit)
+
+	# -------------------------------------------------------------------------
+	# Override string representation of RateLimiter object.
+	def __str__(self):
+		return '[%s: %s, %s]' % (self.__class__.__name__, self.default, ', '.join('%s=%s' % item for item in self.buckets.items()))
+
+	# -------------------------------------------------------------------------
+	# Block until a call to service is allowed.
+	#
+	# service - API service being called
+	# timeout - Seconds to wait at most (None waits forever)
+	def acquire(self, service, timeout=None):
+		bucket = self.buckets.get(service, self.default)
+
+		if bucket is None:
+			return True
+
+		return bucket.acquire(1, timeout)
+
+# -----------------------------------------------------------------------------
+# Testing code
+if __name__ == '__main__':
+
+	# Test TokenBucket
+	print '**** TEST: TokenBucket'
+	bucket	= TokenBucket(10, 5)
+	start	= time.time()
+
+	for x in range(25):
+		bucket.acquire()
+
+	print '25 tokens in %.2f seconds' % (time.time() - start)
+
+	# Test RateLimiter
+	print '**** TEST: RateLimiter'
+	limiter	= RateLimiter(services={'rum': (2, 1)})
+	print limiter
+	print limiter.acquire('monitor'), limiter.acquire('rum'), limiter.acquire('rum', timeout=0.1)
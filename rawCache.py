@@ -0,0 +1,259 @@
+# =============================================================================
+# rawCache.py
+#
+# Bulk retrieval of raw monitor samples (HAR) into a content-addressed, gzip
+# compressed on-disk cache.  Raw samples never change, so a sample already
+# in the cache is never fetched again.  Bodies are streamed straight to disk
+# and read back through memory-mapped files.
+#
+# Layout under the cache directory:
+#   blobs/ab/cdef... - gzip compressed body, named by the SHA-1 of the body
+#   refs/<monitorId>/<sampleId> - SHA-1 of the sample's body
+#
+# Requires non-standard 'client' (WPM) python library to be installed.
+#
+# Version: 1.0
+# Date: 10/17/26
+# =============================================================================
+import os
+import gzip
+import mmap
+import zlib
+import hashlib
+import tempfile
+import jsonCodec
+import jsonStream
+from client import CallResult
+from monitor import Monitor
+from executor import Executor, wait
+from deadline import Deadline, DeadlineExceeded
+
+# -----------------------------------------------------------------------------
+# A write-only file object that hashes what is written and passes it on.
+class HashingWriter:
+
+	def __init__(self, fileobj):
+		self.fileobj	= fileobj
+		self.sha1		= hashlib.sha1()
+		self.size		= 0
+
+	def write(self, data):
+		self.sha1.update(data)
+		self.size += len(data)
+		self.fileobj.write(data)
+
+class RawSampleCache:
+
+	# -------------------------------------------------------------------------
+	# Create a new RawSampleCache object.
+	#
+	# root - Directory of the cache (created if it doesn't exist)
+	# compressLevel - gzip level blobs are written with (1-9)
+	def __init__(self, root='rawSamples', compressLevel=6):
+		self.root			= root
+		self.compressLevel	= compressLevel
+
+		for name in ('blobs', 'refs', 'tmp'):
+			if not os.path.isdir(os.path.join(root, name)):
+				os.makedirs(os.path.join(root, name))
+
+	# -------------------------------------------------------------------------
+	# Override string representation of RawSampleCache object.
+	def __str__(self):
+		return '[%s: %s]' % (self.__class__.__name__, self.root)
+
+	# -------------------------------------------------------------------------
+	# Paths of a sample's ref and of a blob.
+	def refPath(self, monitorId, sampleId):
+		return os.path.join(self.root, 'refs', monitorId, sampleId)
+
+	def blobPath(self, digest):
+		return os.path.join(self.root, 'blobs', digest[:2], digest[2:])
+
+	# -------------------------------------------------------------------------
+	# Get the SHA-1 of a cached sample's body (None if it isn't cached).
+	def digest(self, monitorId, sampleId):
+		try:
+			with open(self.refPath(monitorId, sampleId)) as refFile:
+				return refFile.read().strip()
+		except IOError:
+			return None
+
+	def __contains__(self, pair):
+		return self.digest(*pair) is not None
+
+	# -------------------------------------------------------------------------
+	# Atomically move a finished temporary file into place.
+	def __install(self, tmpPath, path):
+		directory = os.path.dirname(path)
+
+		if not os.path.isdir(directory):
+			try:
+				os.makedirs(directory)
+			except OSError:
+				if not os.path.isdir(directory):
+					raise
+
+		os.rename(tmpPath, path)
+
+	# -------------------------------------------------------------------------
+	# Download one raw sample into the cache, unless it's already there.
+	#
+	# monitor - Monitor client to fetch the sample with
+	# monitorId - ID of the monitoring service
+	# sampleId - ID of the sample
+	#
+	# Returns the SHA-1 of the sample's body.
+	def fetch(self, monitor, monitorId, sampleId):
+		digest = self.digest(monitorId, sampleId)
+
+		if digest is not None:
+			return digest
+
+		fd, tmpPath = tempfile.mkstemp(dir=os.path.join(self.root, 'tmp'))
+
+		try:
+			with os.fdopen(fd, 'wb') as tmpFile:
+				body = gzip.GzipFile(fileobj=tmpFile, mode='wb', compresslevel=self.compressLevel)
+				writer = HashingWriter(body)
+				monitor.downloadRawMonitorSample(monitorId, sampleId, writer)
+				body.close()
+
+			digest = writer.sha1.hexdigest()
+
+			# Identical bodies share one blob
+			if os.path.exists(self.blobPath(digest)):
+				os.remove(tmpPath)
+			else:
+				self.__install(tmpPath, self.blobPath(digest))
+
+			fd, tmpPath = tempfile.mkstemp(dir=os.path.join(self.root, 'tmp'))
+
+			with os.fdopen(fd, 'w') as refFile:
+				refFile.write(digest)
+
+			self.__install(tmpPath, self.refPath(monitorId, sampleId))
+			return digest
+		finally:
+			if os.path.exists(tmpPath):
+				os.remove(tmpPath)
+
+	# -------------------------------------------------------------------------
+	# Download many raw samples into the cache concurrently, skipping any that
+	# are already cached.
+	#
+	# monitor - Monitor client to fetch the samples with
+	# pairs - List of (monitorId, sampleId) tuples
+	# workers - Number of downloads in flight
+	#
+	# Returns a list of CallResult objects (value is the body's SHA-1) in the
+	# same order as pairs.
+	def fetchMany(self, monitor, pairs, workers=8):
+		results	= [None] * len(pairs)
+		missing	= []
+
+		for index, (monitorId, sampleId) in enumerate(pairs):
+			digest = self.digest(monitorId, sampleId)
+
+			if digest is not None:
+				results[index] = CallResult(digest, None)
+			else:
+				missing.append(index)
+
+		if not missing:
+			return results
+
+		executor	= Executor(min(workers, len(missing)), 'wpm-raw')
+		deadline	= Deadline.current()
+		futures		= [executor.submit(Deadline.within, deadline, self.fetch, monitor, *pairs[index]) for index in missing]
+
+		wait(futures, deadline and deadline.remaining())
+
+		for index, future in zip(missing, futures):
+			if future.done() and not future.cancelled():
+				error			= future.exception()
+				results[index]	= CallResult(None if error else future.result(), error)
+			else:
+				future.cancel()
+				results[index]	= CallResult(None, DeadlineExceeded('Deadline of %s seconds exceeded' % deadline.seconds))
+
+		executor.shutdown(False)
+		return results
+
+	# -------------------------------------------------------------------------
+	# Yield the decompressed body of a cached sample in chunks.  The blob is
+	# memory-mapped and inflated a chunk at a time, so neither the compressed
+	# nor the full body is read into memory.
+	#
+	# chunkSize - Compressed bytes to inflate at a time
+	def iterChunks(self, monitorId, sampleId, chunkSize=65536):
+		digest = self.digest(monitorId, sampleId)
+
+		if digest is None:
+			raise KeyError('Raw sample not cached: %s/%s' % (monitorId, sampleId))
+
+		with open(self.blobPath(digest), 'rb') as blobFile:
+			blob = mmap.mmap(blobFile.fileno(), 0, access=mmap.ACCESS_READ)
+
+			try:
+				inflater = zlib.decompressobj(16 + zlib.MAX_WBITS)
+
+				for offset in xrange(0, len(blob), chunkSize):
+					chunk = inflater.decompress(blob[offset:offset + chunkSize])
+
+					if chunk:
+						yield chunk
+
+				chunk = inflater.flush()
+
+				if chunk:
+					yield chunk
+			finally:
+				blob.close()
+
+	# -------------------------------------------------------------------------
+	# Get the whole decompressed body of a cached sample.
+	def read(self, monitorId, sampleId):
+		return ''.join(self.iterChunks(monitorId, sampleId))
+
+	# -------------------------------------------------------------------------
+	# Get the parsed JSON body of a cached sample.
+	def load(self, monitorId, sampleId):
+		return jsonCodec.loads(self.read(monitorId, sampleId))
+
+	# -------------------------------------------------------------------------
+	# Yield the HAR entries of a cached sample one at a time.
+	#
+	# path - Keys leading to the array to yield
+	def iterEntries(self, monitorId, sampleId, path=Monitor.rawEntriesPath):
+		return jsonStream.iterItems(self.iterChunks(monitorId, sampleId), path)
+
+# -----------------------------------------------------------------------------
+# Testing code
+if __name__ == '__main__':
+
+	import shutil
+	from tester import Tester
+
+	# Variables for testing
+	key			= Tester.wpmAPIKey
+	secret		= Tester.wpmAPISecret
+	testService	= '383b86b85d2411e3a8d89848e167c3b7'
+	root		= 'test-raw-samples'
+
+	monitorClient	= Monitor(key, secret)
+	samples			= monitorClient.callItems('getMonitorSamples', testService, {'startDate': '2026-10-16', 'endDate': '2026-10-16'})
+	pairs			= [(testService, sample['id']) for sample in samples[:50]]
+
+	# Test fetchMany
+	print '**** TEST: fetchMany'
+	cache = RawSampleCache(root)
+	print sum(1 for result in cache.fetchMany(monitorClient, pairs) if result.error is None), 'fetched'
+	print sum(1 for result in cache.fetchMany(monitorClient, pairs) if result.error is None), 'cached'
+
+	# Test reading back
+	print '**** TEST: iterEntries'
+	for entry in cache.iterEntries(*pairs[0]):
+		print entry.get('request', {}).get('url'), entry.get('time')
+
+	shutil.rmtree(root)
@@ -0,0 +1,114 @@
+# =============================================================================
+# retryPolicy.py
+#
+# Decides when a failed WPM API call is retried and how long to back off.
+#
+# Requires non-standard 'requests' python library to be installed.
+#
+# Version: 1.0
+# Date: 10/17/26
+# =============================================================================
+import time
+import random
+import requests
+from email.utils import parsedate_tz, mktime_tz
+
+class RetryPolicy:
+
+	# -------------------------------------------------------------------------
+	# Create a new RetryPolicy object.
+	#
+	# maxRetries - Maximum number of retries per call
+	# backoff - Base backoff in seconds (doubled on each retry)
+	# maxBackoff - Upper bound on a single backoff in seconds
+	# statuses - HTTP status codes that are retried
+	# httpMethods - HTTP methods that are safe to retry (idempotent)
+	def __init__(self, maxRetries=3, backoff=0.5, maxBackoff=30, statuses=(429, 500, 502, 503, 504), httpMethods=('GET', 'PUT', 'DELETE')):
+		self.maxRetries		= maxRetries
+		self.backoff		= backoff
+		self.maxBackoff		= maxBackoff
+		self.statuses		= statuses
+		self.httpMethods	= httpMethods
+
+	# -------------------------------------------------------------------------
+	# Override string representation of RetryPolicy object.
+	def __str__(self):
+		return '[%s: %s, %s, %s]' % (self.__class__.__name__, self.maxRetries, self.backoff, self.maxBackoff)
+
+	# -------------------------------------------------------------------------
+	# Decide whether a call should be retried.
+	#
+	# request - Request object describing the call
+	# attempt - Number of retries already made
+	# response - Response received (if any)
+	# error - Exception raised (if any)
+	def shouldRetry(self, request, attempt, response=None, error=None):
+		if attempt >= self.maxRetries or request.httpMethod not in self.httpMethods:
+			return False
+
+		if error is not None:
+			return isinstance(error, (requests.ConnectionError, requests.Timeout))
+
+		return getattr(response, 'status_code', None) in self.statuses
+
+	# -------------------------------------------------------------------------
+	# Get the number of seconds to wait before the next attempt.  A Retry-After
+	# header on the response wins, otherwise exponential backoff with full jitter.
+	#
+	# attempt - Number of retries already made
+	# response - Response received (if any)
+	#
+	# Returns None if Retry-After asks for a longer wait than maxBackoff, in
+	# which case the call shouldn't be retried.
+	def delay(self, attempt, response=None):
+		retryAfter = self.retryAfter(response)
+
+		if retryAfter is not None:
+			return retryAfter if retryAfter <= self.maxBackoff else None
+
+		return random.uniform(0, min(self.maxBackoff, self.backoff * (2 ** attempt)))
+
+	# -------------------------------------------------------------------------
+	# Parse the Retry-After header (seconds or an HTTP date) of a response.
+	def retryAfter(self, response):
+		value = getattr(response, 'headers', {}).get('Retry-After')
+
+		if not value:
+			return None
+
+		try:
+			return max(0, float(value))
+		except ValueError:
+			pass
+
+		date = parsedate_tz(value)
+		return max(0, mktime_tz(date) - time.time()) if date else None
+
+# -----------------------------------------------------------------------------
+# Testing code
+if __name__ == '__main__':
+
+	from client import Request
+
+	# Test __init__
+	print '**** TEST: __init__'
+	policy = RetryPolicy()
+	print policy
+
+	# Test shouldRetry
+	print '**** TEST: shouldRetry'
+	print policy.shouldRetry(Request('monitor', '', 'GET'), 0, error=requests.ConnectionError())
+	print policy.shouldRetry(Request('monitor', '', 'POST'), 0, error=requests.ConnectionError())
+	print policy.shouldRetry(Request('monitor', '', 'GET'), 3, error=requests.ConnectionError())
+
+	# Test delay
+	print '**** TEST: delay'
+	print [round(policy.delay(attempt), 2) for attempt in range(5)]
+
+	# Test Retry-After
+	print '**** TEST: delay (Retry-After)'
+	response = requests.models.Response()
+
+	for retryAfter in ('2', '120'):
+		response.headers['Retry-After'] = retryAfter
+		print retryAfter, policy.delay(0, response)
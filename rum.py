@@ -9,7 +9,7 @@
 # Date: 12/06/13
 # Author: Tyler Fullerton
 # =============================================================================
-from client import Client
+from client import Client, Request
 
 class RUM(Client):
 
@@ -18,8 +18,9 @@ class RUM(Client):
 	#
 	# key - A WPM API Key for an account
 	# secret - A WPM API Secret for an account
-	def __init__(self, key, secret):
-		Client.__init__(self, key, secret, 'rum', '', 'GET')
+	# options - Optional Client settings (ex: transport)
+	def __init__(self, key, secret, **options):
+		Client.__init__(self, key, secret, 'rum', '', 'GET', **options)
 
 	# -------------------------------------------------------------------------
 	# Override string representation of RUM object.
@@ -32,34 +33,22 @@ class RUM(Client):
 	# params - Dictionary containing details of beacon.
 	#  * beaconName: Name of the beacon to create.
 	def createBeacon(self, params):
-		self.setService('rum')
-		self.setMethod('beacon')
-		self.setHttpMethod('POST')
-		return self.call(params)
+		return self.perform('rum', 'beacon', 'POST', params)
 
 	# -------------------------------------------------------------------------
 	# API interaction to list beacons.
 	def listBeacons(self):
-		self.setService('rum')
-		self.setMethod('beacon')
-		self.setHttpMethod('GET')
-		return self.call()
+		return self.perform('rum', 'beacon', 'GET')
 
 	# -------------------------------------------------------------------------
 	# API interaction to update a beacon.
 	def updateBeacon(self, beaconId, params):
-		self.setService('rum')
-		self.setMethod('beacon/' + beaconId)
-		self.setHttpMethod('PUT')
-		return self.call(params)
+		return self.perform('rum', 'beacon/' + beaconId, 'PUT', params)
 
 	# -------------------------------------------------------------------------
 	# API interaction to delete a beacon.
 	def deleteBeacon(self, beaconId):
-		self.setService('rum')
-		self.setMethod('beacon/' + beaconId)
-		self.setHttpMethod('DELETE')
-		return self.call()
+		return self.perform('rum', 'beacon/' + beaconId, 'DELETE')
 
 	# -------------------------------------------------------------------------
 	# API interaction to get performance summary on recent data.
@@ -69,10 +58,7 @@ class RUM(Client):
 	#  * minutes: Number of minutes (between 1 and 60) to aggregate on.
 	#  * allbeacons: Flag to get summary for all beacons (1) or just one (0).
 	def getPerformanceSummaryOnRecentData(self, params):
-		self.setService('rum')
-		self.setMethod('data/summary')
-		self.setHttpMethod('GET')
-		return self.call(params)
+		return self.perform('rum', 'data/summary', 'GET', params)
 
 	# -------------------------------------------------------------------------
 	# API interaction to get recent time series data.
@@ -81,10 +67,7 @@ class RUM(Client):
 	#  * beaconId: The ID of the beacon to get data for.
 	#  * minutes: Number of minutes (between 1 and 60) to get data for.
 	def getRecentTimeSeriesData(self, params):
-		self.setService('rum')
-		self.setMethod('data/ts/recent')
-		self.setHttpMethod('GET')
-		return self.call(params)
+		return self.perform('rum', 'data/ts/recent', 'GET', params)
 
 	# -------------------------------------------------------------------------
 	# API interaction to get time series data for a beacon.
@@ -95,10 +78,7 @@ class RUM(Client):
 	#  * endDate: End date to get data form.
 	#  * type: Day level (daily) or minute level data.
 	def getTimeSeriesData(self, params):
-		self.setService('rum')
-		self.setMethod('data/ts')
-		self.setHttpMethod('GET')
-		return self.call(params)
+		return self.perform('rum', 'data/ts', 'GET', params)
 
 	# -------------------------------------------------------------------------
 	# API interaction to get raw data for a beacon.
@@ -118,10 +98,15 @@ class RUM(Client):
 	#  * country: Filter samples by country.
 	#  * jserr: Filter samples by JS error filename or string (regex).
 	def getRawData(self, params):
-		self.setService('rum')
-		self.setMethod('data/raw')
-		self.setHttpMethod('GET')
-		return self.call(params)
+		return self.perform('rum', 'data/raw', 'GET', params)
+
+	# -------------------------------------------------------------------------
+	# API interaction to stream raw data for a beacon.  Samples are yielded
+	# one at a time as the response arrives.
+	#
+	# params - Dictionary of parameters (see getRawData).
+	def iterRawData(self, params):
+		return self.iterItems(Request('rum', 'data/raw', 'GET', params))
 
 	# -------------------------------------------------------------------------
 	# API interaction to get analysis data.
@@ -140,10 +125,7 @@ class RUM(Client):
 	#  * country: Filter samples by country.
 	#  * jserr: Filter samples by JS error filename or string (regex).
 	def getAnalysisData(self, params):
-		self.setService('rum')
-		self.setMethod('data/analysis')
-		self.setHttpMethod('GET')
-		return self.call(params)
+		return self.perform('rum', 'data/analysis', 'GET', params)
 
 	# -------------------------------------------------------------------------
 	# API interaction to get object level time series data for a beacon.
@@ -153,10 +135,7 @@ class RUM(Client):
 	#  * startDate: The start date to get data for (ISO 8601 formatted datetime).
 	#  * endDate: The end date to get data for (ISO 8601 formatted datetime).
 	def getObjectLevelTimeSeriesData(self, params):
-		self.setService('rum')
-		self.setMethod('data/ol/ts')
-		self.setHttpMethod('GET')
-		return self.call(params)
+		return self.perform('rum', 'data/ol/ts', 'GET', params)
 
 	# -------------------------------------------------------------------------
 	# API interaction to get object level outlier data for a beacon.
@@ -167,10 +146,7 @@ class RUM(Client):
 	#  * endDate: The end date to get data for (ISO 8601 formatted datetime).
 	#  * groupby: Key to group the data by (resource, domain, location_resource, location_domain).	
 	def getObjectLevelOutliersData(self, params):
-		self.setService('rum')
-		self.setMethod('data/ol/outlier')
-		self.setHttpMethod('GET')
-		return self.call(params)
+		return self.perform('rum', 'data/ol/outlier', 'GET', params)
 
 # -----------------------------------------------------------------------------
 # Testing code
@@ -275,6 +251,10 @@ if __name__ == '__main__':
 	response	= rumClient.getRawData(rumParams)	
 	print 'TXT: ' + response.text
 
+	# Test iterRawData
+	print '**** TEST: iterRawData'
+	print 'Got:', sum(1 for sample in rumClient.iterRawData(rumParams))
+
 	# Test getAnalysisData
 	print '**** TEST: getAnalysisData'
 	rumParams['groupby'] = 'url'
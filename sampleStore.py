@@ -0,0 +1,189 @@
+# =============================================================================
+# sampleStore.py
+#
+# A local SQLite store of monitor samples.  Past samples never change, so
+# each monitor keeps a watermark of how far it has been synced and sync()
+# only fetches what came after it.  Queries are then served from disk.
+#
+# Requires non-standard 'client' (WPM) python library to be installed.
+#
+# Version: 1.0
+# Date: 10/17/26
+# =============================================================================
+import time
+import sqlite3
+import itertools
+from samples import SampleTable, toEpoch
+
+class SampleStore:
+
+	schema = '''
+		CREATE TABLE IF NOT EXISTS samples (
+			monitorId	TEXT NOT NULL,
+			startTime	INTEGER NOT NULL,
+			id			TEXT NOT NULL,
+			location	TEXT,
+			duration	INTEGER,
+			status		TEXT,
+			bytes		INTEGER,
+			PRIMARY KEY (monitorId, startTime, id)
+		) WITHOUT ROWID;
+
+		CREATE TABLE IF NOT EXISTS watermarks (
+			monitorId	TEXT PRIMARY KEY,
+			synced		INTEGER NOT NULL
+		);
+	'''
+
+	# -------------------------------------------------------------------------
+	# Create a new SampleStore object.
+	#
+	# path - SQLite database file (created if it doesn't exist)
+	# batchSize - Samples written per executemany()
+	def __init__(self, path='samples.db', batchSize=5000):
+		self.path		= path
+		self.batchSize	= batchSize
+		self.db			= sqlite3.connect(path)
+		self.db.execute('PRAGMA journal_mode=WAL')
+		self.db.execute('PRAGMA synchronous=NORMAL')
+		self.db.executescript(SampleStore.schema)
+
+	# -------------------------------------------------------------------------
+	# Override string representation of SampleStore object.
+	def __str__(self):
+		monitors, samples = self.db.execute('SELECT COUNT(DISTINCT monitorId), COUNT(*) FROM samples').fetchone()
+		return '[%s: %s, %s monitors, %s samples]' % (self.__class__.__name__, self.path, monitors, samples)
+
+	def __enter__(self):
+		return self
+
+	def __exit__(self, *excInfo):
+		self.close()
+
+	# -------------------------------------------------------------------------
+	# Get the epoch second up to which a monitor's samples are stored (None if
+	# it has never been synced).
+	def watermark(self, monitorId):
+		row = self.db.execute('SELECT synced FROM watermarks WHERE monitorId = ?', (monitorId,)).fetchone()
+		return row[0] if row else None
+
+	# -------------------------------------------------------------------------
+	# Fetch and store the samples each monitor has gained since its watermark.
+	# Samples are written in bulk transactions, each moving the watermark up
+	# to the samples it holds, so an interrupted sync picks up where it left
+	# off.
+	#
+	# monitor - Monitor client to fetch samples with
+	# monitorIds - IDs of the monitors to sync
+	# start - Where to start monitors that were never synced (epoch seconds or ISO 8601, default 30 days ago)
+	# lag - Seconds before now left unsynced, as the latest samples may still arrive
+	# options - Options for Monitor.iterMonitorSamples (ex: prefetch)
+	#
+	# Returns a dictionary of monitorId -> samples added.
+	def sync(self, monitor, monitorIds, start=None, lag=600, **options):
+		end		= (int(time.time()) - lag) // 60 * 60
+		added	= {}
+
+		for monitorId in monitorIds:
+			since = self.watermark(monitorId)
+
+			if since is None:
+				since = toEpoch(start) if start is not None else end - 30 * 86400
+
+			added[monitorId] = 0
+
+			if since >= end:
+				continue
+
+			params	= {'startDate': self.__iso(since), 'endDate': self.__iso(end)}
+			samples	= monitor.iterMonitorSamples(monitorId, params, **options)
+
+			while True:
+				rows = [(monitorId, toEpoch(s['startTime']), s['id'], s.get('location'), s.get('duration'), s.get('status'), s.get('bytes'))
+					for s in itertools.islice(samples, self.batchSize)]
+
+				# Only move the watermark past a second once all its samples are in
+				synced = end if len(rows) < self.batchSize else rows[-1][1]
+
+				with self.db:
+					self.db.executemany('INSERT OR IGNORE INTO samples VALUES (?, ?, ?, ?, ?, ?, ?)', rows)
+					self.db.execute('INSERT OR REPLACE INTO watermarks VALUES (?, ?)', (monitorId, max(since, synced)))
+
+				added[monitorId] += len(rows)
+
+				if len(rows) < self.batchSize:
+					break
+
+		return added
+
+	def __iso(self, epoch):
+		return time.strftime('%Y-%m-%dT%H:%M:%S', time.gmtime(epoch))
+
+	# -------------------------------------------------------------------------
+	# Iterate over the stored samples of a monitor in time order, as
+	# dictionaries shaped like the API's.
+	#
+	# monitorId - ID of the monitor
+	# start - Epoch seconds or ISO 8601 timestamp (None is unbounded)
+	# end - Epoch seconds or ISO 8601 timestamp, exclusive (None is unbounded)
+	def samples(self, monitorId, start=None, end=None):
+		cursor = self.db.execute('SELECT id, startTime, location, duration, status, bytes FROM samples WHERE monitorId = ? AND startTime >= ? AND startTime < ? ORDER BY startTime',
+			(monitorId, toEpoch(start) if start is not None else 0, toEpoch(end) if end is not None else 2 ** 62))
+
+		for id, startTime, location, duration, status, bytes in cursor:
+			yield {
+				'id'		: id,
+				'monitorId'	: monitorId,
+				'startTime'	: self.__iso(startTime),
+				'location'	: location,
+				'duration'	: duration,
+				'status'	: status,
+				'bytes'		: bytes,
+			}
+
+	# -------------------------------------------------------------------------
+	# Load the stored samples of a monitor into a SampleTable.
+	#
+	# monitorId - ID of the monitor
+	# start - Epoch seconds or ISO 8601 timestamp (None is unbounded)
+	# end - Epoch seconds or ISO 8601 timestamp, exclusive (None is unbounded)
+	# keepIds - Also keep each sample's ID
+	def table(self, monitorId, start=None, end=None, keepIds=False):
+		return SampleTable(monitorId, keepIds, self.samples(monitorId, start, end))
+
+	# -------------------------------------------------------------------------
+	# Close the database.
+	def close(self):
+		self.db.close()
+
+# -----------------------------------------------------------------------------
+# Testing code
+if __name__ == '__main__':
+
+	import os
+	from tester import Tester
+	from monitor import Monitor
+
+	# Variables for testing
+	key		= Tester.wpmAPIKey
+	secret	= Tester.wpmAPISecret
+	path	= 'test-samples.db'
+
+	monitorClient	= Monitor(key, secret)
+	monitorIds		= [m['id'] for m in monitorClient.callItems('listMonitors')][:3]
+
+	# Test sync
+	print '**** TEST: sync'
+	with SampleStore(path) as store:
+		print store.sync(monitorClient, monitorIds, start=time.time() - 86400)
+		print store.sync(monitorClient, monitorIds)
+		print store
+
+		# Test queries
+		print '**** TEST: table'
+		for monitorId in monitorIds:
+			print store.table(monitorId), store.watermark(monitorId)
+
+	for suffix in ('', '-wal', '-shm'):
+		if os.path.exists(path + suffix):
+			os.remove(path + suffix)
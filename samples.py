@@ -0,0 +1,312 @@
+# =============================================================================
+# samples.py
+#
+# A compact, columnar container for monitor samples.  Each field is a typed
+# array, with location and status dictionary encoded, so a sample costs a
+# couple of dozen bytes instead of a dictionary.  Time range slices are
+# views onto the table rather than copies.
+#
+# NumPy export is available when NumPy is installed.
+#
+# Version: 1.0
+# Date: 10/17/26
+# =============================================================================
+import time
+import array
+import bisect
+import calendar
+
+try:
+	import numpy
+except ImportError:
+	numpy = None
+
+# -----------------------------------------------------------------------------
+# Convert an ISO 8601 timestamp (ex: '2026-10-17T12:00:00') to epoch seconds.
+# Whole days are cached, so only the time of day is parsed per sample.
+_days = {}
+
+def toEpoch(value):
+	if not isinstance(value, basestring):
+		return int(value)
+
+	day = _days.get(value[:10])
+
+	if day is None:
+		day = _days[value[:10]] = calendar.timegm(time.strptime(value[:10], '%Y-%m-%d'))
+
+	if len(value) < 19:
+		return day
+
+	return day + int(value[11:13]) * 3600 + int(value[14:16]) * 60 + int(value[17:19])
+
+# -----------------------------------------------------------------------------
+# A view of one sample in a SampleTable.
+class SampleRow(object):
+
+	__slots__ = ('table', 'index')
+
+	def __init__(self, table, index):
+		self.table = table
+		self.index = index
+
+	def __repr__(self):
+		return '%s(%r)' % (self.__class__.__name__, self.asDict())
+
+	@property
+	def startTime(self):
+		return self.table.startTimes[self.index]
+
+	@property
+	def location(self):
+		return self.table.locations[self.table.locationCodes[self.index]]
+
+	@property
+	def duration(self):
+		return self.table.durations[self.index]
+
+	@property
+	def status(self):
+		return self.table.statuses[self.table.statusCodes[self.index]]
+
+	@property
+	def bytes(self):
+		return self.table.bytes[self.index]
+
+	@property
+	def id(self):
+		return self.table.ids[self.index] if self.table.ids is not None else None
+
+	# -------------------------------------------------------------------------
+	# Get the sample as a dictionary (with startTime in epoch seconds).
+	def asDict(self):
+		return dict((name, getattr(self, name)) for name in SampleTable.fields)
+
+# -----------------------------------------------------------------------------
+# A time ordered range [lo, hi) of a SampleTable, sharing its storage.
+class SampleView(object):
+
+	__slots__ = ('table', 'lo', 'hi')
+
+	def __init__(self, table, lo, hi):
+		self.table	= table
+		self.lo		= lo
+		self.hi		= hi
+
+	def __str__(self):
+		return '[%s: %s samples]' % (self.__class__.__name__, len(self))
+
+	def __len__(self):
+		return self.hi - self.lo
+
+	def __iter__(self):
+		for index in xrange(self.lo, self.hi):
+			yield SampleRow(self.table, index)
+
+	# -------------------------------------------------------------------------
+	# Get a SampleRow by position, or a SampleView for a slice.
+	def __getitem__(self, index):
+		if isinstance(index, slice):
+			lo, hi, step = index.indices(len(self))
+
+			if step != 1:
+				raise ValueError('SampleView slices must be contiguous')
+
+			return SampleView(self.table, self.lo + lo, self.lo + max(lo, hi))
+
+		if index < 0:
+			index += len(self)
+
+		if not 0 <= index < len(self):
+			raise IndexError('sample index out of range')
+
+		return SampleRow(self.table, self.lo + index)
+
+	# -------------------------------------------------------------------------
+	# Get the samples with start <= startTime < end.
+	#
+	# start - Epoch seconds or ISO 8601 timestamp (None is unbounded)
+	# end - Epoch seconds or ISO 8601 timestamp, exclusive (None is unbounded)
+	def between(self, start=None, end=None):
+		times	= self.table.startTimes
+		lo		= self.lo if start is None else bisect.bisect_left(times, toEpoch(start), self.lo, self.hi)
+		hi		= self.hi if end is None else bisect.bisect_left(times, toEpoch(end), lo, self.hi)
+		return SampleView(self.table, lo, hi)
+
+	# -------------------------------------------------------------------------
+	# Get the values of one field for the view (location and status decoded).
+	def column(self, name):
+		table = self.table
+
+		if name == 'location':
+			return [table.locations[code] for code in table.locationCodes[self.lo:self.hi]]
+
+		if name == 'status':
+			return [table.statuses[code] for code in table.statusCodes[self.lo:self.hi]]
+
+		if name == 'id':
+			return table.ids[self.lo:self.hi] if table.ids is not None else None
+
+		return getattr(table, SampleTable.columns[name])[self.lo:self.hi]
+
+	# -------------------------------------------------------------------------
+	# Export the view as NumPy arrays.  Each column is copied in one block, as
+	# the table's arrays may move in memory when samples are appended.
+	# Location and status are returned as codes, with the 'locations' &
+	# 'statuses' lists to decode them.
+	def toNumpy(self):
+		if numpy is None:
+			raise ImportError('NumPy is required for toNumpy()')
+
+		table	= self.table
+		arrays	= {'locations': list(table.locations), 'statuses': list(table.statuses)}
+
+		for name, attr in SampleTable.columns.items():
+			column			= getattr(table, attr)
+			arrays[name]	= numpy.frombuffer(column, dtype=numpy.dtype(column.typecode), count=len(self), offset=self.lo * column.itemsize).copy() if len(self) else numpy.zeros(0, column.typecode)
+
+		return arrays
+
+class SampleTable(SampleView):
+
+	__slots__ = ('monitorId', 'startTimes', 'locationCodes', 'durations', 'statusCodes', 'bytes', 'ids', 'locations', 'statuses', '__locationIndex', '__statusIndex')
+
+	fields	= ('startTime', 'location', 'duration', 'status', 'bytes', 'id')
+
+	# Field name -> array attribute
+	columns	= {'startTime': 'startTimes', 'location': 'locationCodes', 'duration': 'durations', 'status': 'statusCodes', 'bytes': 'bytes'}
+
+	# -------------------------------------------------------------------------
+	# Create a new SampleTable object.
+	#
+	# monitorId - ID of the monitor the samples belong to
+	# keepIds - Also keep each sample's ID (needed to fetch raw samples)
+	# samples - Samples to append (ex: from Monitor.iterMonitorSamples)
+	def __init__(self, monitorId=None, keepIds=False, samples=None):
+		SampleView.__init__(self, self, 0, 0)
+		self.monitorId		= monitorId
+		self.startTimes		= array.array('l')
+		self.locationCodes	= array.array('H')
+		self.durations		= array.array('i')
+		self.statusCodes	= array.array('B')
+		self.bytes			= array.array('l')
+		self.ids			= [] if keepIds else None
+		self.locations		= []
+		self.statuses		= []
+		self.__locationIndex = {}
+		self.__statusIndex	= {}
+
+		if samples is not None:
+			self.extend(samples)
+
+	def __str__(self):
+		return '[%s: %s, %s samples]' % (self.__class__.__name__, self.monitorId, len(self))
+
+	# -------------------------------------------------------------------------
+	# Get the dictionary code of a value, adding it if it's new.
+	def __encode(self, value, index, values):
+		code = index.get(value)
+
+		if code is None:
+			code = index[value] = len(values)
+			values.append(value)
+
+		return code
+
+	# -------------------------------------------------------------------------
+	# Add a sample.  Samples must be appended in time order.
+	#
+	# sample - Sample dictionary as returned by the API
+	def append(self, sample):
+		self.extend((sample,))
+
+	# -------------------------------------------------------------------------
+	# Add samples, in time order.  Works with any iterable, so samples can be
+	# appended straight from a streaming fetch.  If a sample is out of order
+	# (or malformed) none of the batch is kept.
+	def extend(self, samples):
+		startTimes		= self.startTimes
+		locationCodes	= self.locationCodes
+		durations		= self.durations
+		statusCodes		= self.statusCodes
+		sizes			= self.bytes
+		ids				= self.ids
+		locationIndex	= self.__locationIndex
+		statusIndex		= self.__statusIndex
+		count			= len(startTimes)
+		last			= startTimes[-1] if startTimes else None
+
+		try:
+			for sample in samples:
+				startTime = toEpoch(sample['startTime'])
+
+				if last is not None and startTime < last:
+					raise ValueError('Samples must be appended in time order')
+
+				location	= sample.get('location')
+				status		= sample.get('status')
+				last		= startTime
+
+				startTimes.append(startTime)
+				locationCodes.append(locationIndex[location] if location in locationIndex else self.__encode(location, locationIndex, self.locations))
+				durations.append(int(sample.get('duration') or 0))
+				statusCodes.append(statusIndex[status] if status in statusIndex else self.__encode(status, statusIndex, self.statuses))
+				sizes.append(int(sample.get('bytes') or 0))
+
+				if ids is not None:
+					ids.append(sample.get('id'))
+		except BaseException:
+			for column in (startTimes, locationCodes, durations, statusCodes, sizes):
+				del column[count:]
+
+			if ids is not None:
+				del ids[count:]
+
+			raise
+
+		self.hi = len(startTimes)
+
+	# -------------------------------------------------------------------------
+	# Get the approximate bytes used by the columns.
+	def memory(self):
+		size = sum(getattr(self, attr).itemsize * len(self) for attr in SampleTable.columns.values())
+		return size + (sum(len(id or '') + 40 for id in self.ids) if self.ids is not None else 0)
+
+# -----------------------------------------------------------------------------
+# Testing code
+if __name__ == '__main__':
+
+	import random
+
+	# Test building a table
+	print '**** TEST: extend'
+	table	= SampleTable('8a9a2f2b1f3c4d5e', keepIds=True)
+	start	= toEpoch('2026-10-01T00:00:00')
+	table.extend({
+		'id'		: '%08x' % i,
+		'startTime'	: time.strftime('%Y-%m-%dT%H:%M:%S', time.gmtime(start + i * 20)),
+		'location'	: ('washingtondc', 'sanjose', 'london')[i % 3],
+		'duration'	: random.randint(300, 4000),
+		'status'	: 'SUCCESS' if random.random() > 0.03 else 'ERROR',
+		'bytes'		: random.randint(50000, 900000),
+	} for i in range(100000))
+	print table, '%.1f bytes/sample' % (table.memory() / float(len(table)))
+
+	# Test an out of order batch is rejected whole
+	print '**** TEST: extend (out of order)'
+	try:
+		table.extend([{'startTime': start + 10 ** 7}, {'startTime': start}])
+	except ValueError as e:
+		print 'ValueError:', e, len(table), len(table.startTimes), len(table.ids)
+
+	# Test rows and time slices
+	print '**** TEST: between'
+	day = table.between('2026-10-02', '2026-10-03')
+	print day, day[0], day[-1].startTime - day[0].startTime
+	print day[:10].column('location')
+
+	# Test NumPy export
+	if numpy is not None:
+		print '**** TEST: toNumpy'
+		arrays = day.toNumpy()
+		print arrays['duration'].mean(), (arrays['status'] == arrays['statuses'].index('ERROR')).mean()
@@ -19,8 +19,9 @@ class Script(Client):
 	#
 	# key - A WPM API Key for an account
 	# secret - A WPM API Secret for an account
-	def __init__(self, key, secret):
-		Client.__init__(self, key, secret, 'script', 'script', 'GET')
+	# options - Optional Client settings (ex: transport)
+	def __init__(self, key, secret, **options):
+		Client.__init__(self, key, secret, 'script', 'script', 'GET', **options)
 
 	# -------------------------------------------------------------------------
 	# Override string representation of Script object.
@@ -47,11 +48,7 @@ class Script(Client):
 	#
 	# scriptId - The id of the script from the WPM platform.
 	def getScript(self, scriptId=''):
-		self.setService('script')
-		self.setMethod(scriptId)
-		self.setHttpMethod('GET')
-
-		return self.call()
+		return self.perform('script', scriptId, 'GET')
 
 	# -------------------------------------------------------------------------
 	# API interaction to upload a script to the WPM platform.
@@ -63,11 +60,7 @@ class Script(Client):
 		if fileLoc and os.path.exists(fileLoc): 		
 			params['scriptBody'] = self.__readScriptFile(fileLoc)
 
-		self.setService('script')
-		self.setMethod('')
-		self.setHttpMethod('POST')
-
-		return self.call(params)
+		return self.perform('script', '', 'POST', params)
 
 	# -------------------------------------------------------------------------
 	# API interaction to update a script on the WPM platform.
@@ -79,22 +72,14 @@ class Script(Client):
 		params['scriptBody']	= self.__readScriptFile(fileLoc)
 		params['id']			= scriptId				
 
-		self.setService('script')
-		self.setMethod(scriptId)
-		self.setHttpMethod('PUT')
-
-		return self.call(params)
+		return self.perform('script', scriptId, 'PUT', params)
 
 	# -------------------------------------------------------------------------
 	# API interaction to delete a script on the WPM platform.
 	#	
 	# scriptId - The id of the script from the WPM platform.
 	def deleteScript(self, scriptId):
-		self.setService('script')
-		self.setMethod(scriptId)
-		self.setHttpMethod('DELETE')
-
-		return self.call()
+		return self.perform('script', scriptId, 'DELETE')
 
 # -----------------------------------------------------------------------------
 # Testing code
@@ -0,0 +1,108 @@
+# =============================================================================
+# singleFlight.py
+#
+# Coalesces identical in-flight WPM API calls so only one goes on the wire
+# and every caller waiting on it shares its response.
+#
+# Version: 1.0
+# Date: 10/17/26
+# =============================================================================
+import sys
+import threading
+from deadline import Deadline, DeadlineExceeded
+
+class SingleFlight:
+
+	# -------------------------------------------------------------------------
+	# Create a new SingleFlight object.
+	def __init__(self):
+		self.calls		= 0			# Calls that went on the wire
+		self.shared		= 0			# Calls answered by another caller's response
+		self.__flights	= {}
+		self.__lock		= threading.Lock()
+
+	# -------------------------------------------------------------------------
+	# Override string representation of SingleFlight object.
+	def __str__(self):
+		return '[%s: %s calls, %s shared]' % (self.__class__.__name__, self.calls, self.shared)
+
+	# -------------------------------------------------------------------------
+	# Run fn(*args) unless a call with the same key is already in flight, in
+	# which case wait for and share its result (or exception).  A caller that
+	# waits gives up when its thread's Deadline passes, even if the call it
+	# is waiting on has none.
+	#
+	# key - Hashable key identifying the call (ex: Request.key())
+	# fn - Function performing the call
+	def do(self, key, fn, *args):
+		with self.__lock:
+			flight = self.__flights.get(key)
+
+			if flight is None:
+				flight = self.__flights[key] = [threading.Event(), None, None]
+				leader = True
+				self.calls += 1
+			else:
+				leader = False
+				self.shared += 1
+
+		if leader:
+			try:
+				flight[1] = fn(*args)
+			except BaseException:
+				flight[2] = sys.exc_info()
+			finally:
+				with self.__lock:
+					del self.__flights[key]
+				flight[0].set()
+		else:
+			deadline = Deadline.current()
+
+			if deadline is None:
+				flight[0].wait()
+			elif not flight[0].wait(deadline.remaining()):
+				raise DeadlineExceeded('Deadline of %s seconds exceeded waiting on a coalesced call' % deadline.seconds)
+
+		if flight[2]:
+			raise flight[2][0], flight[2][1], flight[2][2]
+
+		return flight[1]
+
+# -----------------------------------------------------------------------------
+# Testing code
+if __name__ == '__main__':
+
+	import time
+	from tester import Tester
+	from monitor import Monitor
+	from asyncClient import AsyncClient
+
+	# Variables for testing
+	key		= Tester.wpmAPIKey
+	secret	= Tester.wpmAPISecret
+
+	# Test do
+	print '**** TEST: do'
+	flight = SingleFlight()
+	print flight.do('key', lambda x: x + 1, 41)
+
+	# Test a waiting caller's deadline
+	print '**** TEST: deadline'
+	leader = threading.Thread(target=flight.do, args=('slow', time.sleep, 1))
+	leader.start()
+	time.sleep(0.05)
+
+	try:
+		with Deadline(0.2):
+			flight.do('slow', time.sleep, 1)
+	except DeadlineExceeded as e:
+		print 'DeadlineExceeded:', e
+
+	leader.join()
+
+	# Test coalescing of concurrent identical calls
+	print '**** TEST: coalesce'
+	asyncMonitor	= AsyncClient(Monitor(key, secret, coalesce=flight))
+	responses		= asyncMonitor.gather([asyncMonitor.getLocations() for x in range(10)])
+	print len(set(id(r) for r in responses)), flight
+	asyncMonitor.close()
@@ -0,0 +1,178 @@
+# =============================================================================
+# transport.py
+#
+# A pooled, keep-alive HTTP transport shared by the WPM API classes.
+#
+# Requires non-standard 'requests' python library to be installed.
+#
+# Version: 1.0
+# Date: 10/17/26
+# =============================================================================
+import time
+import threading
+import requests
+from requests.adapters import HTTPAdapter
+
+# -----------------------------------------------------------------------------
+# Running totals of bytes sent and received, on the wire and decoded.
+class TransferStats:
+
+	# -------------------------------------------------------------------------
+	# Create a new TransferStats object.
+	def __init__(self):
+		self.calls				= 0
+		self.sentWire			= 0		# Request body bytes sent (after compression)
+		self.sentDecoded		= 0		# Request body bytes before compression
+		self.receivedWire		= 0		# Response body bytes received (before decompression)
+		self.receivedDecoded	= 0		# Response body bytes after decompression
+		self.__lock				= threading.Lock()
+
+	# -------------------------------------------------------------------------
+	# Override string representation of TransferStats object.
+	def __str__(self):
+		return '[%s: %s calls, sent %s/%s, received %s/%s]' % (self.__class__.__name__, self.calls, self.sentWire, self.sentDecoded, self.receivedWire, self.receivedDecoded)
+
+	# -------------------------------------------------------------------------
+	# Add the byte counts of one call.
+	def record(self, sentWire, sentDecoded, receivedWire, receivedDecoded):
+		with self.__lock:
+			self.calls				+= 1
+			self.sentWire			+= sentWire
+			self.sentDecoded		+= sentDecoded
+			self.receivedWire		+= receivedWire
+			self.receivedDecoded	+= receivedDecoded
+
+	# -------------------------------------------------------------------------
+	# Get the number of bytes compression kept off the wire.
+	def saved(self):
+		return (self.sentDecoded - self.sentWire) + (self.receivedDecoded - self.receivedWire)
+
+class Transport:
+
+	poolConnections	= 10		# Number of hosts to keep connection pools for
+	poolMaxSize		= 20		# Maximum sockets kept alive per host
+	idleTimeout		= 60		# Seconds of inactivity before sockets are evicted
+	acceptEncoding	= 'gzip, deflate'	# Response compression offered to the server
+
+	__default		= None
+	__defaultLock	= threading.Lock()
+
+	# -------------------------------------------------------------------------
+	# Create a new Transport object.
+	#
+	# poolConnections - Number of per-host connection pools to cache.
+	# poolMaxSize - Maximum number of connections kept alive per host.
+	# keepAlive - Reuse sockets between calls (False sends 'Connection: close').
+	# idleTimeout - Seconds a pool may sit unused before its sockets are closed (0 disables).
+	# poolBlock - Block when a host's pool is exhausted instead of opening a throwaway socket.
+	# acceptEncoding - Accept-Encoding header sent with every request ('identity' disables compression)
+	def __init__(self, poolConnections=None, poolMaxSize=None, keepAlive=True, idleTimeout=None, poolBlock=False, acceptEncoding=None):
+		self.poolConnections	= poolConnections or Transport.poolConnections
+		self.poolMaxSize		= poolMaxSize or Transport.poolMaxSize
+		self.keepAlive			= keepAlive
+		self.idleTimeout		= Transport.idleTimeout if idleTimeout is None else idleTimeout
+		self.poolBlock			= poolBlock
+		self.acceptEncoding		= acceptEncoding or Transport.acceptEncoding
+		self.stats				= TransferStats()
+		self.lastUsed			= time.time()
+		self.lock				= threading.Lock()
+		self.session			= self.__newSession()
+
+	# -------------------------------------------------------------------------
+	# Override string representation of Transport object.
+	def __str__(self):
+		return '[%s: %s, %s, %s, %s]' % (self.__class__.__name__, self.poolConnections, self.poolMaxSize, self.keepAlive, self.idleTimeout)
+
+	# -------------------------------------------------------------------------
+	# Build a requests Session with a sized connection pool mounted.
+	def __newSession(self):
+		session = requests.Session()
+		adapter = HTTPAdapter(pool_connections=self.poolConnections, pool_maxsize=self.poolMaxSize, pool_block=self.poolBlock)
+
+		session.mount('http://', adapter)
+		session.mount('https://', adapter)
+		session.headers['Accept-Encoding'] = self.acceptEncoding
+
+		if not self.keepAlive:
+			session.headers['Connection'] = 'close'
+
+		return session
+
+	# -------------------------------------------------------------------------
+	# Close pooled sockets if the transport has been idle for too long.
+	def __evictIdle(self):
+		now = time.time()
+
+		if self.idleTimeout and now - self.lastUsed > self.idleTimeout:
+			with self.lock:
+				if now - self.lastUsed > self.idleTimeout:
+					self.evict()
+
+		self.lastUsed = now
+
+	# -------------------------------------------------------------------------
+	# Close every pooled socket.  Pools are recreated on the next request.
+	def evict(self):
+		for adapter in self.session.adapters.values():
+			adapter.poolmanager.clear()
+
+	# -------------------------------------------------------------------------
+	# Close the transport and release all of its sockets.
+	def close(self):
+		self.session.close()
+
+	# -------------------------------------------------------------------------
+	# Perform an HTTP request over the pooled session.
+	#
+	# httpMethod - HTTP method (GET, POST, PUT, DELETE)
+	# url - Fully constructed URL to request
+	# kwargs - Additional arguments passed through to requests
+	def request(self, httpMethod, url, **kwargs):
+		self.__evictIdle()
+		return self.session.request(httpMethod, url, **kwargs)
+
+	# -------------------------------------------------------------------------
+	# Get the process wide Transport used by clients that aren't given one.
+	@classmethod
+	def default(cls):
+		if cls.__default is None:
+			with cls.__defaultLock:
+				if cls.__default is None:
+					cls.__default = cls()
+
+		return cls.__default
+
+# -----------------------------------------------------------------------------
+# Testing code
+if __name__ == '__main__':
+
+	from tester import Tester
+	from monitor import Monitor
+	from rum import RUM
+
+	# Variables for testing
+	key		= Tester.wpmAPIKey
+	secret	= Tester.wpmAPISecret
+
+	# Test __init__
+	print '**** TEST: __init__'
+	transport = Transport(poolMaxSize=4, idleTimeout=30)
+	print transport
+
+	# Test default
+	print '**** TEST: default'
+	print Transport.default() is Transport.default()
+
+	# Test shared transport across clients
+	print '**** TEST: shared transport'
+	monitorClient	= Monitor(key, secret, transport=transport)
+	rumClient		= RUM(key, secret, transport=transport)
+	print monitorClient.getLocations().status_code
+	print rumClient.listBeacons().status_code
+
+	# Test evict
+	print '**** TEST: evict'
+	transport.evict()
+	print monitorClient.getLocations().status_code
+	print transport.stats
+	transport.close()
@@ -0,0 +1,104 @@
+# =============================================================================
+# wpm.py
+#
+# A single WPM API session.  Every service client it hands out shares one
+# transport (connection pool), response cache, rate limiter and metrics.
+# Service modules are only imported when first used.
+#
+# Requires non-standard 'client' (WPM) python library to be installed.
+#
+# Version: 1.0
+# Date: 10/17/26
+# =============================================================================
+import threading
+import importlib
+from cache import ResponseCache
+from metrics import Metrics
+from transport import Transport
+
+class WPM:
+
+	# Attribute name -> (module, class) of each service client
+	services = {
+		'monitor'		: ('monitor', 'Monitor'),
+		'rum'			: ('rum', 'RUM'),
+		'load'			: ('loadTest', 'LoadTest'),
+		'script'		: ('script', 'Script'),
+		'instant'		: ('instantTest', 'InstantTest'),
+		'maintenance'	: ('maintenanceWindow', 'MaintenanceWindow'),
+	}
+
+	# -------------------------------------------------------------------------
+	# Create a new WPM object.
+	#
+	# key - A WPM API Key for an account
+	# secret - A WPM API Secret for an account
+	# transport - Transport shared by every service (defaults to a new one)
+	# cache - ResponseCache shared by every service (True for a default one, None disables)
+	# limiter - RateLimiter for the account's quota, shared by every service (None is unlimited)
+	# metrics - Metrics shared by every service (defaults to a new one)
+	# options - Other Client settings applied to every service (ex: retry, breakers)
+	def __init__(self, key, secret, transport=None, cache=None, limiter=None, metrics=None, **options):
+		self.key		= key
+		self.secret		= secret
+		self.transport	= transport or Transport()
+		self.cache		= ResponseCache() if cache is True else cache
+		self.limiter	= limiter
+		self.metrics	= Metrics() if metrics is None else metrics
+		self.options	= options
+		self.__lock		= threading.Lock()
+
+	# -------------------------------------------------------------------------
+	# Override string representation of WPM object.
+	def __str__(self):
+		return '[%s: %s, %s]' % (self.__class__.__name__, self.key, ', '.join(sorted(name for name in WPM.services if name in self.__dict__)))
+
+	def __enter__(self):
+		return self
+
+	def __exit__(self, *excInfo):
+		self.close()
+
+	# -------------------------------------------------------------------------
+	# Create a service client the first time it's used (ex: wpm.monitor).
+	def __getattr__(self, name):
+		if name not in WPM.services:
+			raise AttributeError(name)
+
+		with self.__lock:
+			if name not in self.__dict__:
+				module, className	= WPM.services[name]
+				serviceClass		= getattr(importlib.import_module(module), className)
+				self.__dict__[name]	= serviceClass(self.key, self.secret, transport=self.transport, cache=self.cache,
+					limiter=self.limiter, metrics=self.metrics, **self.options)
+
+			return self.__dict__[name]
+
+	# -------------------------------------------------------------------------
+	# Close the session's pooled connections.
+	def close(self):
+		self.transport.close()
+
+# -----------------------------------------------------------------------------
+# Testing code
+if __name__ == '__main__':
+
+	import sys
+	from tester import Tester
+
+	# Variables for testing
+	key		= Tester.wpmAPIKey
+	secret	= Tester.wpmAPISecret
+
+	# Test lazy service clients
+	print '**** TEST: WPM'
+	wpm = WPM(key, secret, cache=True)
+	print wpm, 'rum' in sys.modules
+	print wpm.monitor.listMonitors()
+	print wpm.rum.transport is wpm.monitor.transport, wpm.rum.cache is wpm.monitor.cache
+	print wpm
+
+	# Test shared metrics
+	print '**** TEST: metrics'
+	print wpm.metrics.exportPrometheus()
+	wpm.close()